@@ -1,17 +1,24 @@
+import logging
 import requests
 import time
 from .storage import init_db, save_payload
 
+logger = logging.getLogger(__name__)
+
 BOOTSTRAP_URL = "https://fantasy.premierleague.com/api/bootstrap-static/"
 FIXTURES_URL = "https://fantasy.premierleague.com/api/fixtures/"
 
+# One pooled session for the life of the engine thread, so consecutive
+# requests to the FPL host reuse the same keep-alive connection.
+_SESSION = requests.Session()
+
 def fetch_and_store(url, name):
-    print(f"Fetching {name}...")
-    r = requests.get(url, timeout=30)
+    logger.info("Fetching %s...", name)
+    r = _SESSION.get(url, timeout=30)
     r.raise_for_status()
     data = r.json()
     save_payload(name, data)
-    print(f"Saved {name}")
+    logger.info("Saved %s", name)
 
 def run_once():
     init_db()
@@ -21,5 +28,5 @@ def run_once():
 def loop():
     while True:
         run_once()
-        print("Sleeping 6 hours...")
+        logger.info("Sleeping 6 hours...")
         time.sleep(21600)
@@ -1,28 +1,50 @@
 import sqlite3
 import os
-import json
+import threading
+
+try:
+    import orjson
+except ImportError:  # stdlib json is the fallback
+    orjson = None
+    import json
 
 DB_PATH = os.environ.get("DB_PATH", "apps/dsdeepparser/minimal_engine/fpl_data.db")
 
+# One long-lived connection shared by the engine thread and any other
+# callers; opened lazily so importing the module never touches the disk.
+_CONN = None
+_LOCK = threading.Lock()
+
+def _conn() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+    return _CONN
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS raw_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            endpoint TEXT,
-            payload TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with _LOCK:
+        conn = _conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS raw_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                endpoint TEXT,
+                payload TEXT
+            )
+        """)
+        conn.commit()
+
+def _dumps(payload) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
 
 def save_payload(endpoint: str, payload: dict):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO raw_data (endpoint, payload) VALUES (?, ?)",
-        (endpoint, json.dumps(payload))
-    )
-    conn.commit()
-    conn.close()
+    with _LOCK:
+        conn = _conn()
+        conn.execute(
+            "INSERT INTO raw_data (endpoint, payload) VALUES (?, ?)",
+            (endpoint, _dumps(payload))
+        )
+        conn.commit()
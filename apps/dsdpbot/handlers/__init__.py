@@ -1,12 +1,140 @@
 import asyncio
 import logging
+import multiprocessing
+import re
 import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
 from telegram.ext import ContextTypes
 from config import ADMIN_IDS, PARSER_ROOT
 
 logger = logging.getLogger(__name__)
 
+# Parser entry points, imported once at startup rather than on every button press.
+if PARSER_ROOT not in sys.path:
+    sys.path.insert(0, PARSER_ROOT)
+try:
+    from packages.core.etl import run_etl_for_current_gw
+except ImportError as e:  # parser tree not deployed next to the bot
+    logger.warning("ETL unavailable: %s", e)
+    run_etl_for_current_gw = None
+try:
+    from apps.dsdeepparser.sources.elo import update_team_elo
+except ImportError as e:
+    logger.warning("Elo update unavailable: %s", e)
+    update_team_elo = None
+
+# The ETL is synchronous and runs for minutes; one worker process keeps it off
+# the event loop (and out of the GIL), and repeated presses queue instead of overlapping.
+_etl_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_etl_executor() -> ProcessPoolExecutor:
+    """The ETL worker pool, started on first use.
+
+    The worker is spawned rather than forked: by then the bot process already
+    runs an event loop and helper threads, which a fork would copy mid-state.
+    """
+    global _etl_executor
+    if _etl_executor is None:
+        _etl_executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _etl_executor
+
+async def shutdown_etl_executor(application=None) -> None:
+    """post_shutdown hook: drop queued ETL runs and stop the worker process."""
+    global _etl_executor
+    if _etl_executor is not None:
+        _etl_executor.shutdown(wait=False, cancel_futures=True)
+        _etl_executor = None
+
+async def _sh(*args: str, timeout: float = 10) -> str:
+    """Run a command without blocking the event loop; return stdout like check_output."""
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, out, err)
+    return out.decode()
+
+def _railway_ssh(command: str) -> tuple:
+    """argv for running a shell *command* inside the DSDeepParser service."""
+    return ("railway", "ssh", "-s", "DSDeepParser", command)
+
+def _remote_sqlite(sql: str, *options: str) -> tuple:
+    """argv for running *sql* against the parser database over railway ssh."""
+    opts = "".join(f"{o} " for o in options)
+    return _railway_ssh(f'sqlite3 {opts}/app/data/fpl_data.db "{sql}"')
+
+# All three counts in one ssh round trip, printed as a single "a|b|c" row.
+_DB_STATS_SQL = (
+    "SELECT (SELECT COUNT(*) FROM league_standings_1125782),"
+    " (SELECT COUNT(*) FROM features), (SELECT COUNT(*) FROM lri_scores);"
+)
+_DB_STATS_TTL = 60.0
+_db_stats_cache = (0.0, None)  # (monotonic fetch time, counts)
+
+async def _get_db_stats() -> list:
+    global _db_stats_cache
+    fetched_at, counts = _db_stats_cache
+    if counts is None or time.monotonic() - fetched_at >= _DB_STATS_TTL:
+        out = await _sh(*_remote_sqlite(_DB_STATS_SQL, "-separator '|'"))
+        counts = out.strip().split("|")
+        _db_stats_cache = (time.monotonic(), counts)
+    return counts
+
+_LOG_TTL = 30.0
+_LOG_CACHE: dict = {}  # (service, n) -> (monotonic fetch time, log text, error lines)
+_ERR_RE = re.compile(r"ERROR|Traceback")
+
+async def _fetch_logs(n: int, service: str, ttl: float) -> tuple:
+    key = (service, n)
+    cached = _LOG_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached
+    logs = await _sh("railway", "logs", "-s", service, "-n", str(n))
+    errors = [line for line in logs.splitlines() if _ERR_RE.search(line)]
+    entry = _LOG_CACHE[key] = (time.monotonic(), logs, errors)
+    return entry
+
+async def _get_logs(n: int = 100, service: str = "DSDeepParser", ttl: float = _LOG_TTL) -> str:
+    """Last *n* lines of *service*'s railway logs, reused for *ttl* seconds."""
+    return (await _fetch_logs(n, service, ttl))[1]
+
+async def _get_log_errors(n: int = 100, service: str = "DSDeepParser", ttl: float = _LOG_TTL) -> list:
+    """ERROR/Traceback lines of the cached log fetch, filtered once per fetch."""
+    return (await _fetch_logs(n, service, ttl))[2]
+
+_SEND_INTERVAL = 1 / 29  # stay under Telegram's ~30 messages/s per-bot limit
+_send_lock = asyncio.Lock()
+_next_send_at = 0.0
+
+async def _send_paced(bot, chat_id: int, text: str, attempts: int = 3) -> None:
+    """send_message through a bot-wide pace; RetryAfter halts every sender."""
+    global _next_send_at
+    for _ in range(attempts):
+        async with _send_lock:
+            delay = _next_send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            _next_send_at = time.monotonic() + _SEND_INTERVAL
+        try:
+            await bot.send_message(chat_id, text)
+            return
+        except RetryAfter as e:
+            # int seconds on older PTB releases, timedelta on newer ones
+            wait = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+            _next_send_at = max(_next_send_at, time.monotonic() + wait)
+    logger.warning("Giving up on message to %s after %d rate-limited attempts", chat_id, attempts)
+
 async def is_admin(update: Update) -> bool:
     return update.effective_user.id in ADMIN_IDS
 
@@ -50,10 +178,8 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def show_status(query):
     try:
-        logs = subprocess.check_output(
-            ["railway", "logs", "-s", "DSDeepParser", "-n", "20"],
-            text=True, timeout=10
-        )
+        # Tail of the shared 100-line fetch, so status/errors/watcher hit railway once.
+        logs = "\n".join((await _get_logs(100)).rstrip("\n").split("\n")[-20:])
         msg = f"📡 Последние 20 строк логов DSDeepParser:\n<pre>{logs[-1500:]}</pre>"
     except Exception as e:
         msg = f"❌ Не удалось получить логи: {e}"
@@ -65,22 +191,16 @@ async def run_etl(query):
 
 async def _run_etl_task(query):
     try:
-        import sys
-        sys.path.insert(0, PARSER_ROOT)
-        from packages.core.etl import run_etl_for_current_gw
-        run_etl_for_current_gw()
+        if run_etl_for_current_gw is None:
+            raise RuntimeError(f"packages.core.etl не найден в {PARSER_ROOT}")
+        await asyncio.get_running_loop().run_in_executor(_get_etl_executor(), run_etl_for_current_gw)
         await query.edit_message_text("✅ ETL завершён успешно.")
     except Exception as e:
         await query.edit_message_text(f"❌ Ошибка ETL: {e}")
 
 async def db_stats(query):
     try:
-        cmd = "railway ssh -s DSDeepParser 'sqlite3 /app/data/fpl_data.db \"SELECT COUNT(*) FROM league_standings_1125782;\"'"
-        count_league = subprocess.check_output(cmd, shell=True, text=True, timeout=10).strip()
-        cmd = "railway ssh -s DSDeepParser 'sqlite3 /app/data/fpl_data.db \"SELECT COUNT(*) FROM features;\"'"
-        count_features = subprocess.check_output(cmd, shell=True, text=True, timeout=10).strip()
-        cmd = "railway ssh -s DSDeepParser 'sqlite3 /app/data/fpl_data.db \"SELECT COUNT(*) FROM lri_scores;\"'"
-        count_lri = subprocess.check_output(cmd, shell=True, text=True, timeout=10).strip()
+        count_league, count_features, count_lri = await _get_db_stats()
         msg = (
             f"📊 **Статистика базы данных**\n\n"
             f"• league_standings_1125782: **{count_league}** записей\n"
@@ -97,9 +217,8 @@ async def run_elo(query):
 
 async def _run_elo_task(query):
     try:
-        import sys
-        sys.path.insert(0, PARSER_ROOT)
-        from apps.dsdeepparser.sources.elo import update_team_elo
+        if update_team_elo is None:
+            raise RuntimeError(f"apps.dsdeepparser.sources.elo не найден в {PARSER_ROOT}")
         await update_team_elo()
         await query.edit_message_text("✅ Elo успешно обновлён.")
     except Exception as e:
@@ -107,11 +226,7 @@ async def _run_elo_task(query):
 
 async def show_errors(query):
     try:
-        logs = subprocess.check_output(
-            ["railway", "logs", "-s", "DSDeepParser", "-n", "100"],
-            text=True, timeout=10
-        )
-        errors = [line for line in logs.split('\n') if 'ERROR' in line or 'Traceback' in line]
+        errors = await _get_log_errors(100)
         if errors:
             msg = "🚨 **Последние ошибки**\n" + "\n".join(errors[-10:])
         else:
@@ -129,24 +244,19 @@ async def _backup_task(query):
         import datetime
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = f"/app/data/backup_{timestamp}.sql"
-        cmd = f"railway ssh -s DSDeepParser 'sqlite3 /app/data/fpl_data.db \".dump\" > {backup_file}'"
-        subprocess.run(cmd, shell=True, check=True, timeout=30)
+        await _sh(*_railway_ssh(f'sqlite3 /app/data/fpl_data.db ".dump" > {backup_file}'), timeout=30)
         await query.edit_message_text(f"✅ Бэкап сохранён на сервере: `{backup_file}`", parse_mode="Markdown")
     except Exception as e:
         await query.edit_message_text(f"❌ Ошибка создания бэкапа: {e}")
 
 async def error_watcher(context: ContextTypes.DEFAULT_TYPE):
     try:
-        logs = subprocess.check_output(
-            ["railway", "logs", "-s", "DSDeepParser", "-n", "100"],
-            text=True, timeout=10
-        )
-        errors = [line for line in logs.split('\n') if 'ERROR' in line or 'Traceback' in line]
+        errors = await _get_log_errors(100)
         if errors:
-            for admin_id in ADMIN_IDS:
-                await context.bot.send_message(
-                    admin_id,
-                    f"🚨 В парсере обнаружены ошибки!\n{errors[-5]}"
-                )
+            text = f"🚨 В парсере обнаружены ошибки!\n{errors[-5]}"
+            await asyncio.gather(
+                *(_send_paced(context.bot, admin_id, text) for admin_id in ADMIN_IDS),
+                return_exceptions=True,
+            )
     except Exception:
         pass
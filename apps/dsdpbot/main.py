@@ -2,12 +2,12 @@
 import os
 import logging
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler
-from handlers import start, button_handler, error_watcher
+from handlers import start, button_handler, error_watcher, shutdown_etl_executor
 from config import TELEGRAM_TOKEN, ADMIN_IDS, setup_logging
 
 def main():
     setup_logging()
-    app = Application.builder().token(TELEGRAM_TOKEN).build()
+    app = Application.builder().token(TELEGRAM_TOKEN).post_shutdown(shutdown_etl_executor).build()
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CallbackQueryHandler(button_handler))
     
@@ -17,12 +17,13 @@ class CircuitBreaker:
         self.timeout = timeout
         self.state = self.CLOSED
         self.failure_count = 0
-        self.last_failure_time = 0.0
+        self.last_failure_time = 0.0  # time.monotonic() of the latest failure
+        self._reopen_at = 0.0  # monotonic deadline after which OPEN turns HALF_OPEN
 
     @property
     def is_open(self) -> bool:
         if self.state == self.OPEN:
-            if time.time() - self.last_failure_time > self.timeout:
+            if time.monotonic() > self._reopen_at:
                 self.state = self.HALF_OPEN
                 return False
             return True
@@ -36,7 +37,8 @@ class CircuitBreaker:
 
     def record_failure(self) -> None:
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
+        self._reopen_at = self.last_failure_time + self.timeout
         if self.failure_count >= self.failure_threshold:
             self.state = self.OPEN
             logger.warning("Circuit breaker %s → OPEN", self.name)
@@ -1,12 +1,31 @@
 """Abstract base for every data source."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
 import logging
 
+import aiohttp
+
 logger = logging.getLogger(__name__)
 
 
+async def close_session_pool(session_pool: "asyncio.Queue[aiohttp.ClientSession]") -> None:
+    """
+    Drain *session_pool* on shutdown and close every session concurrently.
+
+    Register it with ``Scheduler.on_shutdown`` next to the pool's creation.
+    """
+    sessions = []
+    while not session_pool.empty():
+        sessions.append(session_pool.get_nowait())
+    results = await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+    for exc in results:
+        if isinstance(exc, Exception):
+            logger.warning("Error closing pooled session: %s", exc)
+
+
 class DataSource(ABC):
     def __init__(self, config: Dict, global_config: Dict,
                  rate_limiter=None, session_pool=None):
@@ -15,6 +34,38 @@ class DataSource(ABC):
         self.name: str = config["name"]
         self.enabled: bool = config.get("enabled", True)
         self.schedule: Optional[str] = config.get("schedule")
+        # Transform and store in slices of this many records (None = whole run at once)
+        self.batch_size: Optional[int] = config.get("batch_size")
+        self.rate_limiter = rate_limiter
+        # asyncio.Queue of aiohttp.ClientSession shared by every source and HttpFetcher
+        self.session_pool = session_pool
+
+    @asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Borrow a pooled ``aiohttp.ClientSession`` for the duration of a request.
+
+        The session goes back to ``session_pool`` afterwards so its connections
+        stay warm between scheduler ticks.  Without a pool, a private session is
+        opened and closed around the block.
+        """
+        if self.session_pool is None:
+            async with aiohttp.ClientSession() as session:
+                yield session
+            return
+        if self.session_pool.empty():
+            session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, use_dns_cache=True, keepalive_timeout=30,
+            ))
+        else:
+            session = self.session_pool.get_nowait()
+        try:
+            yield session
+        finally:
+            if self.session_pool.full():
+                await session.close()
+            else:
+                self.session_pool.put_nowait(session)
 
     @abstractmethod
     async def fetch(self) -> Any:
@@ -32,10 +83,19 @@ class DataSource(ABC):
     async def store(self, records: List[Dict]) -> None:
         ...
 
+    async def close(self) -> None:
+        """Release resources the source opened during a run; called when ``run`` ends."""
+
     async def run(self):
         """Fetch → parse → transform → store pipeline."""
         if not self.enabled:
             return
+        try:
+            await self._run_pipeline()
+        finally:
+            await self.close()
+
+    async def _run_pipeline(self):
         raw = await self.fetch()
         if raw is None:
             logger.warning("Source %s: fetch returned None, skipping", self.name)
@@ -44,9 +104,32 @@ class DataSource(ABC):
         if not parsed:
             logger.warning("Source %s: no records after parse", self.name)
             return
+        if self.batch_size and len(parsed) > self.batch_size:
+            total = await self._run_batched(parsed)
+            logger.info("Source %s: pipeline complete (%d records)", self.name, total)
+            return
         transformed = await self.transform(parsed)
         if not transformed:
             logger.warning("Source %s: no records after transform", self.name)
             return
         await self.store(transformed)
         logger.info("Source %s: pipeline complete (%d records)", self.name, len(transformed))
+
+    async def _run_batched(self, parsed: List[Dict]) -> int:
+        """
+        Transform and store *parsed* ``batch_size`` records at a time.
+
+        Only one batch of transformed records is alive at once.  Sources opt in
+        via ``batch_size`` when their transform works record by record and their
+        storage appends rather than overwrites.
+        """
+        total = 0
+        for start in range(0, len(parsed), self.batch_size):
+            batch = parsed[start:start + self.batch_size]
+            transformed = await self.transform(batch)
+            if transformed:
+                await self.store(transformed)
+                total += len(transformed)
+        if not total:
+            logger.warning("Source %s: no records after transform", self.name)
+        return total
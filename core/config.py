@@ -3,13 +3,28 @@
 import os
 import yaml
 
-_config = None
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
+
+_config = None  # (mtime_ns, parsed config)
 
 
 def get_config() -> dict:
+    """
+    Parsed ``config.yaml``, loaded once per process.
+
+    With ``DSDP_CFG_WATCH=1`` the file is re-stat'ed on every call and
+    re-parsed when its mtime changes.
+    """
     global _config
-    if _config is None:
-        path = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
-        with open(path, "r", encoding="utf-8") as f:
-            _config = yaml.safe_load(f)
-    return _config
+    if _config is not None and os.environ.get("DSDP_CFG_WATCH") != "1":
+        return _config[1]
+    mtime_ns = os.stat(_CONFIG_PATH).st_mtime_ns
+    if _config is None or _config[0] != mtime_ns:
+        with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
+            _config = (mtime_ns, yaml.load(f, Loader=_YamlLoader))
+    return _config[1]
@@ -3,37 +3,46 @@ HTTP fetcher with:
  - URL template substitution  ({league_id}, {manager_id}, etc.)
  - Pagination (page-based)
  - Adaptive rate limiting
- - File-based caching
+ - File-based caching (JSON / raw text, atomic writes)
  - Retry via tenacity
  - Circuit breaker
 """
 
 import aiohttp
 import asyncio
+import functools
 import logging
 import os
-import pickle
 import hashlib
+import itertools
 import time
-import random
 import re
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
 
+try:
+    import xxhash
+except ImportError:  # hashlib.blake2b is the fallback
+    xxhash = None
+
 from tenacity import (
     retry, stop_after_attempt, wait_exponential,
     retry_if_exception_type, before_sleep_log,
 )
 from circuit_breaker import CircuitBreaker
+from utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+_MISS = object()  # cache-lookup sentinel; None is a legitimate payload
+_MEM_CACHE_MAX = 1024
+
 
 class HttpFetcher:
     def __init__(
         self,
         config: Dict,
         rate_limiter,
-        session_pool: asyncio.Queue,
         proxies: List[str],
         user_agents: List[str],
         cache_dir: str = "./cache",
@@ -43,12 +52,21 @@ class HttpFetcher:
         self.config = config
         self.global_config = global_config or {}
         self.rate_limiter = rate_limiter
-        self.session_pool = session_pool
+        self._session: Optional[aiohttp.ClientSession] = None
         self.proxies = proxies
         self.user_agents = user_agents
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
         self._proxy_index = 0
+        self._ua_cycle = itertools.cycle(user_agents or ["Mozilla/5.0"])
+        # ck -> (expires_at, is_json, raw bytes). Raw bytes rather than decoded
+        # payloads, because parsers and transformers mutate what they are given.
+        self._mem_cache: "OrderedDict[str, tuple[float, bool, bytes]]" = OrderedDict()
+        # ck -> future of the request already on the wire for that key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Cleared while a 429 Retry-After is being honoured, pausing every request
+        self._green = asyncio.Event()
+        self._green.set()
         self.circuit_breaker = CircuitBreaker(source_name)
 
     # ── helpers ──────────────────────────────────────────────────────
@@ -59,62 +77,174 @@ class HttpFetcher:
         self._proxy_index += 1
         return proxy
 
-    def _get_random_ua(self) -> str:
-        return random.choice(self.user_agents) if self.user_agents else "Mozilla/5.0"
+    def _get_next_ua(self) -> str:
+        return next(self._ua_cycle)
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self.session_pool.empty():
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The fetcher's long-lived session, created on first use."""
+        if self._session is None or self._session.closed:
             connector = aiohttp.TCPConnector(
                 limit=100, ttl_dns_cache=300, use_dns_cache=True, keepalive_timeout=30,
+                enable_cleanup_closed=True,
             )
-            return aiohttp.ClientSession(connector=connector)
-        return await self.session_pool.get()
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
 
-    async def _release_session(self, session: aiohttp.ClientSession):
-        if self.session_pool.qsize() < self.session_pool.maxsize:
-            await self.session_pool.put(session)
-        else:
-            await session.close()
+    async def close(self) -> None:
+        """Close the shared session; the next request opens a fresh one."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     def _cache_key(self, url: str, params: dict) -> str:
-        key = url + str(sorted(params.items()))
-        return hashlib.md5(key.encode()).hexdigest()
+        # Non-cryptographic: the key only has to spread cache file names.
+        key = (url + str(sorted(params.items()))).encode()
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(key)
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+    def _remember(self, ck: str, expires_at: float, is_json: bool, raw: bytes) -> None:
+        self._mem_cache[ck] = (expires_at, is_json, raw)
+        self._mem_cache.move_to_end(ck)
+        if len(self._mem_cache) > _MEM_CACHE_MAX:
+            self._mem_cache.popitem(last=False)
+
+    @staticmethod
+    def _decode_cached(is_json: bool, raw: bytes) -> Any:
+        return json_loads(raw) if is_json else raw.decode("utf-8")
+
+    async def _read_cache(self, ck: str, ttl: float) -> Any:
+        """Return the cached payload for *ck*, or ``_MISS`` if absent or stale.
+
+        Warm keys are served from the in-memory index without touching disk;
+        cold ones are read in a worker thread so the event loop keeps running.
+        """
+        hit = self._mem_cache.get(ck)
+        if hit is not None:
+            expires_at, is_json, raw = hit
+            if time.time() < expires_at:
+                self._mem_cache.move_to_end(ck)
+                return self._decode_cached(is_json, raw)
+            del self._mem_cache[ck]
+        found = await asyncio.to_thread(self._read_cache_file, ck, ttl)
+        if found is None:
+            return _MISS
+        expires_at, is_json, raw = found
+        self._remember(ck, expires_at, is_json, raw)
+        return self._decode_cached(is_json, raw)
+
+    def _read_cache_file(self, ck: str, ttl: float) -> Optional[tuple[float, bool, bytes]]:
+        now = time.time()
+        for ext in (".json", ".txt"):
+            cp = os.path.join(self.cache_dir, ck + ext)
+            try:
+                mtime = os.path.getmtime(cp)
+                if now - mtime >= ttl:
+                    continue
+                with open(cp, "rb") as f:
+                    return mtime + ttl, ext == ".json", f.read()
+            except OSError:
+                continue
+        return None
+
+    async def _write_cache(self, ck: str, data: Any, ttl: float) -> None:
+        """Store *data* as JSON (text responses verbatim); the file is written off-loop."""
+        is_json = not isinstance(data, str)
+        raw = json_dumps(data) if is_json else data.encode("utf-8")
+        self._remember(ck, time.time() + ttl, is_json, raw)
+        await asyncio.to_thread(self._write_cache_file, ck, is_json, raw)
+
+    def _write_cache_file(self, ck: str, is_json: bool, raw: bytes) -> None:
+        """Write-then-rename, so readers never see a partial file."""
+        cp = os.path.join(self.cache_dir, ck + (".json" if is_json else ".txt"))
+        tmp = f"{cp}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, cp)
 
     # ── URL template ─────────────────────────────────────────────────
     @staticmethod
     def _render_url(url_template: str, params: dict) -> tuple[str, dict]:
         """Replace {placeholders} in URL and return (rendered_url, remaining_query_params)."""
-        rendered = url_template
-        used_keys: set[str] = set()
-        for key, val in params.items():
-            placeholder = "{" + key + "}"
-            if placeholder in rendered:
-                rendered = rendered.replace(placeholder, str(val))
-                used_keys.add(key)
-        remaining = {k: v for k, v in params.items() if k not in used_keys}
+        used = _url_placeholders(url_template) & params.keys()
+        if not used:
+            return url_template, dict(params)
+        rendered = _PLACEHOLDER.sub(
+            lambda m: str(params[m.group(1)]) if m.group(1) in used else m.group(0),
+            url_template,
+        )
+        remaining = {k: v for k, v in params.items() if k not in used}
         return rendered, remaining
 
     # ── single request with retry ────────────────────────────────────
     async def _fetch_one(self, url: str, params: dict) -> Optional[Any]:
+        """
+        Fetch one URL, served from cache when fresh.
+
+        Concurrent calls for the same URL and params share a single request;
+        each caller decodes its own copy of the body, so callers may mutate
+        what they get back.  If the caller that owns the request is cancelled,
+        the others are not: the next one in line sends the request itself.
+        """
         cache_ttl = self.config.get(
             "cache_ttl",
             self.global_config.get("network", {}).get("cache_ttl_default", 0),
         )
+        ck = self._cache_key(url, params)
 
         # Cache check
         if cache_ttl > 0:
-            ck = self._cache_key(url, params)
-            cp = os.path.join(self.cache_dir, ck + ".pkl")
-            if os.path.exists(cp) and (time.time() - os.path.getmtime(cp)) < cache_ttl:
+            cached = await self._read_cache(ck, cache_ttl)
+            if cached is not _MISS:
                 logger.debug("Cache hit: %s", url)
-                with open(cp, "rb") as f:
-                    return pickle.load(f)
+                return cached
+
+        while (pending := self._inflight.get(ck)) is not None:
+            logger.debug("Joining in-flight request: %s", url)
+            try:
+                body = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only the owner was cancelled, not us: take over the request
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            return None if body is None else self._decode_body(*body)
 
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[ck] = pending
+        try:
+            body = await self._request(url, params)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(exc)
+                pending.exception()  # waiters re-raise it; no "never retrieved" warning
+            raise
+        else:
+            pending.set_result(body)
+        finally:
+            del self._inflight[ck]
+
+        if body is None:
+            return None
+        data = self._decode_body(*body)
+        if cache_ttl > 0:
+            await self._write_cache(ck, data, cache_ttl)
+        return data
+
+    @staticmethod
+    def _decode_body(is_json: bool, body: Any) -> Any:
+        return json_loads(body) if is_json else body
+
+    async def _request(self, url: str, params: dict) -> Optional[tuple[bool, Any]]:
+        """Send the request; return ``(is_json, raw bytes or text)``, or ``None`` on 404."""
+        await self._green.wait()
         await self.rate_limiter.wait_if_needed()
 
         method = self.config.get("method", "GET").upper()
         headers = self.config.get("headers", {}).copy()
-        headers["User-Agent"] = self._get_random_ua()
+        headers["User-Agent"] = self._get_next_ua()
         proxy = self._get_next_proxy()
 
         # Auth
@@ -128,7 +258,7 @@ class HttpFetcher:
                 headers["Authorization"] = f"Basic {base64.b64encode(cred.encode()).decode()}"
 
         timeout = aiohttp.ClientTimeout(total=self.config.get("timeout", 30))
-        session = await self._get_session()
+        session = self._get_session()
         try:
             async with session.request(
                 method, url, params=params, headers=headers,
@@ -137,22 +267,24 @@ class HttpFetcher:
                 if resp.status == 200:
                     ct = resp.content_type or ""
                     if "json" in ct:
-                        data = await resp.json()
+                        body = (True, await resp.read())
                     else:
-                        data = await resp.text()
+                        body = (False, await resp.text())
                     self.rate_limiter.update_delay(success=True)
-                    # Save cache
-                    if cache_ttl > 0:
-                        ck = self._cache_key(url, params)
-                        cp = os.path.join(self.cache_dir, ck + ".pkl")
-                        with open(cp, "wb") as f:
-                            pickle.dump(data, f)
-                    return data
+                    return body
 
                 if resp.status == 429:
                     retry_after = int(resp.headers.get("Retry-After", 60))
-                    logger.warning("429 rate-limit, sleeping %ds", retry_after)
-                    await asyncio.sleep(retry_after)
+                    if self._green.is_set():
+                        # First 429 of a burst holds back every request, not just this one
+                        logger.warning("429 rate-limit, pausing requests for %ds", retry_after)
+                        self._green.clear()
+                        try:
+                            await asyncio.sleep(retry_after)
+                        finally:
+                            self._green.set()
+                    else:
+                        await self._green.wait()
                     self.rate_limiter.update_delay(success=False)
                     raise aiohttp.ClientResponseError(
                         resp.request_info, resp.history, status=resp.status
@@ -169,8 +301,6 @@ class HttpFetcher:
         except Exception:
             self.rate_limiter.update_delay(success=False)
             raise
-        finally:
-            await self._release_session(session)
 
     # ── public API ───────────────────────────────────────────────────
     async def fetch(self, params: Optional[Dict] = None) -> Any:
@@ -189,26 +319,7 @@ class HttpFetcher:
 
             pagination = self.config.get("pagination")
             if pagination:
-                page_param = pagination["param"]
-                start = pagination.get("start", 1)
-                max_pages = pagination.get("max_pages", 10)
-                for page in range(start, start + max_pages):
-                    qp = dict(query_params)
-                    qp[page_param] = page
-                    data = await self._fetch_one(url, qp)
-                    if data is None:
-                        break
-                    if isinstance(data, list) and len(data) == 0:
-                        break
-                    results.append(data)
-                    # Check if we should stop (no more pages)
-                    if isinstance(data, dict):
-                        # Handle FPL-style nested pagination
-                        has_next = _deep_get(data, "standings.has_next") or \
-                                   _deep_get(data, "has_next") or \
-                                   data.get("has_next")
-                        if has_next is False:
-                            break
+                results.extend(await self._fetch_pages(url, query_params, pagination))
             else:
                 data = await self._fetch_one(url, query_params)
                 if data is not None:
@@ -220,23 +331,70 @@ class HttpFetcher:
             return results[0]
         return results
 
+    async def _fetch_pages(self, url: str, query_params: dict, pagination: dict) -> List[Any]:
+        """
+        Fetch pages ``concurrency`` at a time (default 4), in page order.
+
+        The walk stops at the first page that is missing, empty or reports
+        ``has_next: false``; later pages from the same window are dropped,
+        so the result matches a one-page-at-a-time walk.  If a page raises,
+        the rest of its window is cancelled and the error propagates.
+        """
+        page_param = pagination["param"]
+        start = pagination.get("start", 1)
+        stop = start + pagination.get("max_pages", 10)
+        window = max(1, pagination.get("concurrency", 4))
+        pages: List[Any] = []
+        for first in range(start, stop, window):
+            tasks = [
+                asyncio.create_task(self._fetch_one(url, {**query_params, page_param: page}))
+                for page in range(first, min(first + window, stop))
+            ]
+            try:
+                batch = await asyncio.gather(*tasks)
+            finally:
+                # On error, stop the rest of the window instead of leaving it running
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            for data in batch:
+                if data is None:
+                    return pages
+                if isinstance(data, list) and len(data) == 0:
+                    return pages
+                pages.append(data)
+                # Check if we should stop (no more pages)
+                if isinstance(data, dict):
+                    # Handle FPL-style nested pagination
+                    has_next = _deep_get(data, "standings.has_next") or \
+                               _deep_get(data, "has_next") or \
+                               data.get("has_next")
+                    if has_next is False:
+                        return pages
+        return pages
+
     @staticmethod
     def _expand_params(params: dict) -> List[dict]:
         """Expand list-valued params into a Cartesian product of param dicts."""
         list_keys = [k for k, v in params.items() if isinstance(v, list)]
         if not list_keys:
             return [params]
-        key = list_keys[0]
-        values = params[key]
-        rest = {k: v for k, v in params.items() if k != key}
-        sub_list = HttpFetcher._expand_params(rest)
-        result = []
-        for val in values:
-            for sub in sub_list:
-                new = sub.copy()
-                new[key] = val
-                result.append(new)
-        return result
+        scalars = {k: v for k, v in params.items() if not isinstance(v, list)}
+        # Last list key first, as the recursive expansion used to order them.
+        rev_keys = list_keys[::-1]
+        return [
+            {**scalars, **dict(zip(rev_keys, combo[::-1]))}
+            for combo in itertools.product(*(params[k] for k in list_keys))
+        ]
+
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+@functools.lru_cache(maxsize=256)
+def _url_placeholders(url_template: str) -> frozenset:
+    """Names of the ``{placeholders}`` in a URL template, parsed once per template."""
+    return frozenset(_PLACEHOLDER.findall(url_template))
 
 
 def _deep_get(d: dict, path: str, default=None):
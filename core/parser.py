@@ -9,11 +9,12 @@ JsonParser correctly handles:
 
 from abc import ABC, abstractmethod
 from typing import Any, List, Dict
-import json
 import csv
 from io import StringIO
 import logging
 
+from utils import json_loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,10 +27,16 @@ class BaseParser(ABC):
 class JsonParser(BaseParser):
     def __init__(self, config: Dict):
         self.extract_path = config.get("extract")
+        # Path split once: "$.standings.results[*]" -> ("standings", "results").
+        # A wildcard step reads the same key as a plain one, and a missing key
+        # ends extraction with [] either way, so only the keys are kept.
+        parts = self.extract_path.strip("$.").split(".") if self.extract_path else []
+        self._keys = tuple(p[:-3] if p.endswith("[*]") else p for p in parts)
+        self._root_key = parts[0].rstrip("[*]") if parts else None
 
     def parse(self, raw: Any) -> List[Dict]:
         if isinstance(raw, str):
-            data = json.loads(raw)
+            data = json_loads(raw)
         else:
             data = raw
 
@@ -68,27 +75,17 @@ class JsonParser(BaseParser):
         """Check whether the extract_path root key exists in the object."""
         if not self.extract_path:
             return False
-        first_key = self.extract_path.strip("$.").split(".")[0].rstrip("[*]")
-        return first_key in obj
+        return self._root_key in obj
 
     def _extract_one(self, data: Any) -> List[Dict]:
         """Navigate an extract path like ``$.standings.results[*]``."""
-        parts = self.extract_path.strip("$.").split(".")
         current = data
-        for i, part in enumerate(parts):
-            if part.endswith("[*]"):
-                key = part[:-3]
-                if isinstance(current, dict):
-                    current = current.get(key, [])
-                else:
-                    return []
-                if i == len(parts) - 1:
-                    break
-            else:
-                if isinstance(current, dict):
-                    current = current.get(part, {})
-                else:
-                    return []
+        for key in self._keys:
+            if not isinstance(current, dict):
+                return []
+            current = current.get(key)
+            if current is None:
+                return []
         if isinstance(current, list):
             return current
         if current:
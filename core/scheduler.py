@@ -1,5 +1,8 @@
 """Async scheduler wrapper around APScheduler."""
 
+import asyncio
+from typing import Awaitable, Callable, List
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import logging
@@ -10,6 +13,7 @@ logger = logging.getLogger(__name__)
 class Scheduler:
     def __init__(self):
         self.scheduler = AsyncIOScheduler(job_defaults={"misfire_grace_time": 300})
+        self._on_shutdown: List[Callable[[], Awaitable]] = []
 
     def add_job(self, func, trigger, id: str, **kwargs):
         if isinstance(trigger, str):
@@ -17,8 +21,16 @@ class Scheduler:
         self.scheduler.add_job(func, trigger, id=id, **kwargs)
         logger.info("Scheduled job %s: %s", id, trigger)
 
+    def on_shutdown(self, callback: Callable[[], Awaitable]) -> None:
+        """Await *callback()* once the jobs stop, e.g. ``notifier.close`` or a session pool drain."""
+        self._on_shutdown.append(callback)
+
     def start(self):
         self.scheduler.start()
 
     async def shutdown(self):
         self.scheduler.shutdown(wait=False)
+        results = await asyncio.gather(*(cb() for cb in self._on_shutdown), return_exceptions=True)
+        for exc in results:
+            if isinstance(exc, Exception):
+                logger.warning("Shutdown callback failed: %s", exc)
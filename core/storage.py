@@ -3,6 +3,9 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict
 import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class BaseStorage(ABC):
@@ -16,11 +19,31 @@ class BaseStorage(ABC):
 
 
 class MultiStorage(BaseStorage):
-    """Fan-out storage: writes to multiple backends in parallel."""
+    """Fan-out storage: writes to multiple backends in parallel.
+
+    A failing backend is logged and does not cancel the others; the write
+    only raises if every backend failed. At most ``parallelism`` backends
+    are written to at once.
+    """
 
-    def __init__(self, storages: List[BaseStorage]):
+    def __init__(self, storages: List[BaseStorage], parallelism: int = 8):
         self.storages = storages
+        self.parallelism = parallelism
 
     async def store(self, records: List[Dict], source_config: Dict) -> None:
-        tasks = [s.store(records, source_config) for s in self.storages]
-        await asyncio.gather(*tasks)
+        sem = asyncio.Semaphore(self.parallelism)
+
+        async def _store(storage: BaseStorage) -> None:
+            async with sem:
+                await storage.store(records, source_config)
+
+        results = await asyncio.gather(
+            *(_store(s) for s in self.storages), return_exceptions=True
+        )
+        errors = []
+        for storage, result in zip(self.storages, results):
+            if isinstance(result, Exception):
+                logger.error("Store to %s failed: %s", type(storage).__name__, result)
+                errors.append(result)
+        if errors and len(errors) == len(self.storages):
+            raise errors[0]
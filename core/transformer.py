@@ -1,19 +1,249 @@
 """Record transformations: rename, compute, filter, flatten, template, custom."""
 
+import ast
+import functools
+import itertools
 import logging
+import operator
 import re
 import os
 import importlib.util
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from jinja2 import Template
 
+try:
+    import numpy as np
+except ImportError:  # vectorized compute/filter is optional
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Names available to compute expressions (filters get none).
+_EXPR_BUILTINS = {"len": len, "sum": sum, "min": min, "max": max, "abs": abs, "round": round}
+
+# Below this many records the per-record eval path is cheaper than building columns.
+_VECTORIZE_MIN_RECORDS = 256
+
+_NP_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+# int64 kernels must stay within the range where they match Python ints and
+# int/float mixing (true division, comparisons) is exact.
+_INT_EXACT = 2 ** 53
+_INT_CHECKED_OPS = (operator.add, operator.sub, operator.mul)
+
+_NP_CMPOPS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+
+class _BlankMissing(dict):
+    """format_map mapping that renders missing fields as "" like Jinja's Undefined."""
+
+    def __missing__(self, key):
+        return ""
+
+
+def _placeholder_format(src: str) -> Optional[str]:
+    """
+    Translate a template made only of literal text and ``{{ field }}`` placeholders
+    into an equivalent ``str.format`` string, or return ``None``.
+
+    Literal text must be brace-free, and newline handling must not matter
+    (Jinja strips one trailing newline and normalises ``\r\n``).
+    """
+    if "\r" in src or src.endswith("\n"):
+        return None
+    parts = []
+    pos = 0
+    for m in _PLACEHOLDER.finditer(src):
+        literal = src[pos:m.start()]
+        if "{" in literal or "}" in literal:
+            return None
+        parts.append(literal)
+        parts.append("{" + m.group(1) + "}")
+        pos = m.end()
+    tail = src[pos:]
+    if "{" in tail or "}" in tail:
+        return None
+    parts.append(tail)
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(src: str) -> Callable[[Dict], str]:
+    """
+    Compile a template once per distinct source string into ``render(record)``.
+
+    Plain ``{{ field }}`` substitution skips Jinja and goes through
+    ``str.format_map``; anything else renders through a cached Jinja Template.
+    """
+    fmt = _placeholder_format(src)
+    if fmt is not None:
+        def render(record: Dict) -> str:
+            try:
+                return fmt.format_map(record)
+            except KeyError:
+                return fmt.format_map(_BlankMissing(record))
+        return render
+    tpl = Template(src)
+    return lambda record: tpl.render(**record)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expr(src: str, kind: str):
+    """Compile an eval-mode expression once; ``None`` if it is not valid Python."""
+    try:
+        return compile(src, f"<{kind}>", "eval")
+    except SyntaxError as exc:
+        logger.warning("Invalid %s expression %r: %s", kind, src, exc)
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_compute(expr: str):
+    """Split ``field = formula`` and compile the formula; ``None`` if malformed."""
+    lhs, sep, formula = expr.partition("=")
+    field = lhs.strip()
+    formula = formula.strip()
+    if not sep or not formula or not field.replace("_", "").isalnum():
+        return None
+    code = _compile_expr(formula, "compute")
+    return (field, formula, code) if code is not None else None
+
+
+class _NotVectorizable(Exception):
+    pass
+
+
+def _int_checked(op, left, right):
+    """``op(left, right)``, raising OverflowError if an int64 result may have wrapped."""
+    out = op(left, right)
+    if getattr(out, "dtype", None) is not None and out.dtype.kind == "i":
+        approx = op(np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64))
+        if np.any(np.abs(approx) >= _INT_EXACT):
+            raise OverflowError("int64 result outside exact range")
+    return out
+
+
+def _lower(node: ast.AST, names: set, kind: str):
+    """Turn an expression node into ``fn(cols) -> ndarray | scalar``."""
+    if isinstance(node, ast.Name):
+        if kind == "compute" and node.id in _EXPR_BUILTINS:
+            raise _NotVectorizable(node.id)
+        names.add(node.id)
+        key = node.id
+        return lambda cols: cols[key]
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        if type(value) is int and abs(value) >= _INT_EXACT:
+            raise _NotVectorizable("int constant")
+        return lambda cols: value
+    if isinstance(node, ast.BinOp) and type(node.op) in _NP_BINOPS:
+        op = _NP_BINOPS[type(node.op)]
+        left, right = _lower(node.left, names, kind), _lower(node.right, names, kind)
+        if op in _INT_CHECKED_OPS:
+            return lambda cols: _int_checked(op, left(cols), right(cols))
+        return lambda cols: op(left(cols), right(cols))
+    if isinstance(node, ast.UnaryOp):
+        operand = _lower(node.operand, names, kind)
+        if isinstance(node.op, ast.USub):
+            return lambda cols: -operand(cols)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.Not):
+            return lambda cols: np.logical_not(operand(cols))
+    if isinstance(node, ast.Compare) and all(type(o) in _NP_CMPOPS for o in node.ops):
+        terms = [_lower(n, names, kind) for n in [node.left, *node.comparators]]
+        ops = [_NP_CMPOPS[type(o)] for o in node.ops]
+
+        def compare(cols):
+            vals = [t(cols) for t in terms]
+            result = ops[0](vals[0], vals[1])
+            for i in range(1, len(ops)):
+                result = np.logical_and(result, ops[i](vals[i], vals[i + 1]))
+            return result
+        return compare
+    # ``and``/``or`` return operands, not booleans — only the truth value matters for filters.
+    if isinstance(node, ast.BoolOp) and kind == "filter":
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        parts = [_lower(v, names, kind) for v in node.values]
+        return lambda cols: functools.reduce(combine, (p(cols) for p in parts))
+    if (isinstance(node, ast.Call) and kind == "compute" and isinstance(node.func, ast.Name)
+            and node.func.id == "abs" and len(node.args) == 1 and not node.keywords):
+        arg = _lower(node.args[0], names, kind)
+        return lambda cols: np.abs(arg(cols))
+    raise _NotVectorizable(type(node).__name__)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expr_to_numpy(formula: str, kind: str):
+    """
+    Lower a compute/filter expression to a NumPy kernel over whole columns.
+
+    Returns ``(fn, column_names)`` or ``None`` when the expression uses anything
+    beyond numeric arithmetic, comparisons and boolean logic.
+    """
+    if np is None:
+        return None
+    try:
+        names: set[str] = set()
+        fn = _lower(ast.parse(formula.strip(), mode="eval").body, names, kind)
+    except (SyntaxError, _NotVectorizable):
+        return None
+    return fn, frozenset(names)
+
+
+def _fuse_map(steps: List[tuple]) -> Callable[[List[Dict]], List[Dict]]:
+    """
+    Compose per-record ``(label, fn)`` steps so a block of them costs one pass.
+
+    Each record is copied on the way in, so steps that update records in place
+    never touch the input.  If any step raises, the block is re-run one step at
+    a time from the input and only the failing step is skipped, as if the steps
+    had not been fused.
+    """
+    fns = [fn for _, fn in steps]
+
+    def run(records):
+        try:
+            out = []
+            append = out.append
+            for r in records:
+                r = dict(r)
+                for fn in fns:
+                    r = fn(r)
+                append(r)
+            return out
+        except Exception:
+            pass
+        for label, fn in steps:
+            try:
+                records = [fn(dict(r)) for r in records]
+            except Exception as exc:
+                logger.error("Transform step %s failed: %s", label, exc)
+        return records
+    return run
+
 
 class Transformer:
     def __init__(self, steps: List[Dict], custom_functions_path: str = "transformations.py"):
         self.steps = steps or []
         self.custom_functions = self._load_custom_functions(custom_functions_path)
+        self._stages = self._plan(self.steps)
 
     def _load_custom_functions(self, path: str) -> dict:
         if not os.path.exists(path):
@@ -32,54 +262,161 @@ class Transformer:
             return {}
 
     def transform(self, records: List[Dict]) -> List[Dict]:
-        for step in self.steps:
+        """
+        Run the configured steps over *records*.
+
+        Steps are planned once at construction time: adjacent per-record steps
+        are fused into a single pass, while filters, vectorizable computes and
+        custom functions run as whole-batch stages.  If a step raises, the error
+        is logged and the records continue as they were before that step.
+
+        Vectorized compute steps update records in place, so callers must not
+        rely on the input dicts staying unchanged.
+        """
+        for label, run in self._stages:
+            try:
+                records = run(records)
+            except Exception as exc:
+                logger.error("Transform step %s failed: %s", label, exc)
+        return records
+
+    def _plan(self, steps: List[Dict]) -> List[tuple]:
+        """Compile *steps* into ``(label, fn(records) -> records)`` stages."""
+        stages: List[tuple] = []
+        block: List[tuple] = []
+
+        def close_block():
+            if block:
+                stages.append(("+".join(op for op, _ in block), _fuse_map(list(block))))
+                block.clear()
+
+        for step in steps:
             op = step.get("operation")
             try:
-                if op == "rename":
-                    records = [self._rename(r, step["mapping"]) for r in records]
-                elif op == "compute":
-                    records = [self._compute(r, step["expression"]) for r in records]
-                elif op == "filter":
-                    records = [r for r in records if self._evaluate(r, step["condition"])]
-                elif op == "flatten":
-                    records = [self._flatten(r) for r in records]
-                elif op == "template":
-                    records = [self._apply_template(r, step["template"], step["target_field"]) for r in records]
-                elif op == "custom":
-                    fn = step["function"]
-                    if fn in self.custom_functions:
-                        records = [self.custom_functions[fn](r) for r in records]
-                    else:
-                        logger.warning("Custom function %s not found", fn)
-                elif op == "add_field":
-                    # Add a static or computed field
-                    key, val = step["field"], step["value"]
-                    records = [{**r, key: val} for r in records]
-                else:
-                    logger.warning("Unknown transform operation: %s", op)
+                kind, fn = self._compile_step(op, step)
             except Exception as exc:
                 logger.error("Transform step %s failed: %s", op, exc)
-        return records
+                continue
+            if kind == "map":
+                block.append((op, fn))
+            elif kind == "batch":
+                close_block()
+                stages.append((op, fn))
+        close_block()
+        return stages
+
+    def _compile_step(self, op: str, step: Dict) -> tuple:
+        """Return ``("map", fn(record))``, ``("batch", fn(records))`` or ``(None, None)``."""
+        if op == "rename":
+            return "map", functools.partial(self._rename, mapping=step["mapping"])
+        if op == "compute":
+            compiled = _compile_compute(step["expression"])
+            if not compiled:
+                return None, None
+            field, formula, code = compiled
+            if _compile_expr_to_numpy(formula, "compute") is None:
+                return "map", functools.partial(self._compute, field=field, formula=code)
+
+            def compute(records):
+                values = self._vector_eval(records, formula, "compute")
+                if values is None:
+                    return [self._compute(r, field, code) for r in records]
+                for r, v in zip(records, values.tolist()):
+                    r[field] = v
+                return records
+            return "batch", compute
+        if op == "filter":
+            condition = step["condition"]
+            code = _compile_expr(condition, "filter")
+
+            def keep(records):
+                if code is None:
+                    return []  # an invalid condition rejects every record
+                mask = self._vector_eval(records, condition, "filter")
+                if mask is not None:
+                    return list(itertools.compress(records, mask.astype(bool).tolist()))
+                return [r for r in records if self._evaluate(r, code)]
+            return "batch", keep
+        if op == "flatten":
+            return "map", self._flatten
+        if op == "template":
+            tpl = _compile_template(step["template"])
+            target = step["target_field"]
+
+            def apply_template(record):
+                record[target] = tpl(record)
+                return record
+            return "map", apply_template
+        if op == "custom":
+            fn = self.custom_functions.get(step["function"])
+            if fn is None:
+                logger.warning("Custom function %s not found", step["function"])
+                return None, None
+            return "batch", lambda records: [fn(r) for r in records]
+        if op == "add_field":
+            # Add a static or computed field
+            key, val = step["field"], step["value"]
+
+            def add_field(record):
+                record[key] = val
+                return record
+            return "map", add_field
+        logger.warning("Unknown transform operation: %s", op)
+        return None, None
+
+    @staticmethod
+    def _vector_eval(records: List[Dict], formula: str, kind: str):
+        """
+        Evaluate *formula* over all records at once.
+
+        Returns one value per record, or ``None`` when the per-record eval path
+        must be used instead: too few records, an expression the NumPy lowering
+        does not cover, a column that is not uniformly int or float (missing
+        keys included), ints too large for exact int64/float64 arithmetic, or
+        an arithmetic error such as division by zero.
+        """
+        if len(records) < _VECTORIZE_MIN_RECORDS:
+            return None
+        lowered = _compile_expr_to_numpy(formula, kind)
+        if lowered is None:
+            return None
+        fn, names = lowered
+        cols = {}
+        for name in names:
+            values = [r.get(name) for r in records]
+            types = set(map(type, values))
+            if types != {int} and types != {float}:
+                return None
+            col = np.asarray(values)
+            if col.dtype.kind == "O" or (
+                col.dtype.kind in "iu" and (col.max() >= _INT_EXACT or col.min() <= -_INT_EXACT)
+            ):
+                return None
+            cols[name] = col
+        try:
+            with np.errstate(all="raise"):
+                out = fn(cols)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+        return np.broadcast_to(out, (len(records),))
 
     @staticmethod
     def _rename(record: Dict, mapping: Dict) -> Dict:
         return {mapping.get(k, k): v for k, v in record.items()}
 
     @staticmethod
-    def _compute(record: Dict, expr: str) -> Dict:
-        m = re.match(r"(\w+)\s*=\s*(.+)", expr)
-        if m:
-            field, formula = m.groups()
-            ctx = record.copy()
-            ctx.update({"len": len, "sum": sum, "min": min, "max": max, "abs": abs, "round": round})
-            try:
-                record[field] = eval(formula, {"__builtins__": {}}, ctx)
-            except Exception as exc:
-                logger.debug("Compute '%s' skipped for record: %s", formula, exc)
+    def _compute(record: Dict, field: str, formula) -> Dict:
+        """Set ``record[field]`` to *formula* (source or compiled code) evaluated on the record."""
+        ctx = record.copy()
+        ctx.update(_EXPR_BUILTINS)
+        try:
+            record[field] = eval(formula, {"__builtins__": {}}, ctx)
+        except Exception as exc:
+            logger.debug("Compute '%s' skipped for record: %s", field, exc)
         return record
 
     @staticmethod
-    def _evaluate(record: Dict, condition: str) -> bool:
+    def _evaluate(record: Dict, condition) -> bool:
         try:
             return bool(eval(condition, {"__builtins__": {}}, record))
         except Exception:
@@ -87,16 +424,17 @@ class Transformer:
 
     @staticmethod
     def _flatten(record: Dict, parent_key: str = "", sep: str = "_") -> Dict:
-        items = []
-        for k, v in record.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(Transformer._flatten(v, new_key, sep).items())
+        """Flatten nested dicts into ``parent_child`` keys, depth-first in key order."""
+        out: Dict = {}
+        stack = [(parent_key, iter(record.items()))]
+        while stack:
+            prefix, items = stack[-1]
+            for k, v in items:
+                new_key = f"{prefix}{sep}{k}" if prefix else k
+                if isinstance(v, dict):
+                    stack.append((new_key, iter(v.items())))
+                    break
+                out[new_key] = v
             else:
-                items.append((new_key, v))
-        return dict(items)
-
-    @staticmethod
-    def _apply_template(record: Dict, template_str: str, target: str) -> Dict:
-        record[target] = Template(template_str).render(**record)
-        return record
+                stack.pop()
+        return out
@@ -6,8 +6,6 @@ sys.stderr.flush()
 import os
 import logging
 import signal
-import os
-import sys
 from datetime import datetime
 
 import metrics
@@ -7,16 +7,24 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Rows read from SQLite per chunk; bounds export memory regardless of table size.
+EXPORT_CHUNK_ROWS = 50_000
+
 
 class Exporter:
     def __init__(self, config: dict):
         self.config = config
         self.csv_dir = Path(config.get("csv_dir", "exports"))
         self.csv_dir.mkdir(exist_ok=True)
+        self.formats = tuple(config.get("formats", ("csv",)))
 
     async def export_all(self) -> None:
         """Export features + LRI to configured formats."""
         logger.info("Running scheduled export…")
+        # SQLite reads and file writes block; keep them off the event loop.
+        await asyncio.to_thread(self._export_all_sync)
+
+    def _export_all_sync(self) -> None:
         try:
             import sqlite3
             import pandas as pd
@@ -27,16 +35,14 @@ class Exporter:
                 return
 
             conn = sqlite3.connect(db_path)
+            conn.execute("PRAGMA query_only=1")
 
             for table in ("features", "lri_scores", "league_standings"):
                 try:
-                    df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
-                    if df.empty:
-                        continue
                     ts = datetime.now().strftime("%Y%m%d")
-                    csv_path = self.csv_dir / f"{table}_{ts}.csv"
-                    df.to_csv(csv_path, index=False)
-                    logger.info("Exported %s → %s (%d rows)", table, csv_path, len(df))
+                    rows = self._export_table(conn, table, ts)
+                    if rows:
+                        logger.info("Exported %s → %s (%d rows)", table, self.csv_dir, rows)
                 except Exception as exc:
                     logger.debug("Export of %s skipped: %s", table, exc)
 
@@ -46,6 +52,40 @@ class Exporter:
         except Exception as exc:
             logger.error("Export failed: %s", exc)
 
+    def _export_table(self, conn, table: str, ts: str) -> int:
+        """Stream *table* to the configured formats chunk by chunk; returns rows written."""
+        import pandas as pd
+
+        csv_path = self.csv_dir / f"{table}_{ts}.csv"
+        parquet_path = self.csv_dir / f"{table}_{ts}.parquet"
+        writer = None
+        rows = 0
+        try:
+            for chunk in pd.read_sql_query(
+                f'SELECT * FROM "{table}"', conn, chunksize=EXPORT_CHUNK_ROWS,
+            ):
+                if chunk.empty:
+                    continue
+                if "csv" in self.formats:
+                    chunk.to_csv(csv_path, index=False, header=rows == 0, mode="w" if rows == 0 else "a")
+                if "parquet" in self.formats:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    if writer is None:
+                        # All-NULL columns in the first chunk would pin a null type; TEXT is what SQLite stores.
+                        schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                        schema = pa.schema([
+                            f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema
+                        ])
+                        writer = pq.ParquetWriter(parquet_path, schema, compression="snappy")
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
     async def scheduled_export(self, hour: int) -> None:
         while True:
             now = datetime.now()
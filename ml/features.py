@@ -15,11 +15,26 @@ Output: ``features`` table and ``lri_scores`` table.
 import asyncio
 import logging
 import sqlite3
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence
 from datetime import datetime, timezone
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; plain NumPy is used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Column order of the rows built by MLFeatureEngine._compute_manager_features.
+FEATURE_COLUMNS = (
+    "manager_id", "manager_name", "rank", "total_points", "event_points",
+    "form_5gw", "rank_percentile", "total_points_norm", "transfer_efficiency",
+    "total_transfers", "transfer_cost", "captain_accuracy", "bench_utilization",
+    "consistency_score", "xg_team_trend", "opponent_elo_norm", "calculated_at",
+)
+
 
 class MLFeatureEngine:
     """Calculates ML features from raw parsed data."""
@@ -36,6 +51,9 @@ class MLFeatureEngine:
         "opponent_elo_norm": 0.10,
         "consistency_score": 0.05,
     }
+    # The same weights frozen at class creation for the LRI kernel
+    _LRI_FIELDS = tuple(LRI_WEIGHTS)
+    _LRI_WEIGHTS_VEC = np.array(list(LRI_WEIGHTS.values()), dtype=np.float64)
 
     def __init__(self, db, config: dict = None):
         self.db = db
@@ -52,33 +70,31 @@ class MLFeatureEngine:
                 logger.warning("No managers found for feature calculation")
                 return
 
-            # 2. Get support data
-            elo_data = await self._get_elo_map()
-            understat_data = await self._get_understat_map()
-            fixture_data = await self._get_fixture_map()
-
-            # 3. Calculate features per manager
-            all_features = []
-            for mgr in managers:
-                mgr_id = mgr.get("entry") or mgr.get("manager_id")
-                if not mgr_id:
-                    continue
-                features = await self._compute_manager_features(
-                    mgr_id, mgr, elo_data, understat_data, fixture_data,
-                )
-                if features:
-                    all_features.append(features)
-
-            # 4. Store features
-            if all_features:
-                await self.db.store(all_features, {
+            # 2. Get support data (independent reads, run concurrently)
+            elo_data, understat_data, fixture_data, history = await asyncio.gather(
+                self._get_elo_map(),
+                self._get_understat_map(),
+                self._get_fixture_map(),
+                self._get_history_bulk(),
+            )
+
+            # 3. Calculate features per manager (one row tuple each); CPU-bound,
+            #    so it runs in a worker thread to keep the event loop responsive
+            now = datetime.now(timezone.utc).isoformat()  # one calculated_at for the whole run
+            rows = await asyncio.to_thread(
+                self._feature_rows, managers, history, elo_data, understat_data, now,
+            )
+
+            # 4. Store features; dicts are only built here, for the storage layer
+            if rows:
+                await self.db.store([dict(zip(FEATURE_COLUMNS, row)) for row in rows], {
                     "table": "features",
                     "mode": "overwrite",
                 })
-                logger.info("Stored %d feature records", len(all_features))
+                logger.info("Stored %d feature records", len(rows))
 
-                # 5. Calculate and store LRI
-                lri_records = self._calculate_lri(all_features)
+                # 5. Calculate and store LRI from the column view
+                lri_records = self._calculate_lri(dict(zip(FEATURE_COLUMNS, zip(*rows))))
                 if lri_records:
                     await self.db.store(lri_records, {
                         "table": "lri_scores",
@@ -137,50 +153,62 @@ class MLFeatureEngine:
         except Exception:
             return []
 
-    async def _get_manager_history(self, manager_id) -> List[Dict]:
+    async def _get_history_bulk(self) -> List[Dict]:
+        """Every manager's history in one query, grouped by manager in GW order."""
         try:
             return await self.db.query(
-                "SELECT * FROM manager_history WHERE manager_id = ? ORDER BY event",
-                (str(manager_id),),
+                "SELECT * FROM manager_history ORDER BY manager_id, event"
             )
         except Exception:
             return []
 
     # ── Feature computation ──────────────────────────────────────────
 
-    async def _compute_manager_features(
+    def _feature_rows(
         self,
-        manager_id,
-        standing: Dict,
+        managers: List[Dict],
+        history: List[Dict],
         elo_data: Dict,
         understat_data: Dict,
-        fixture_data: List[Dict],
-    ) -> Optional[Dict]:
-        """Compute feature vector for a single manager."""
+        now: str,
+    ) -> List[tuple]:
+        """Feature rows for every manager that has an id."""
+        history_stats = _history_stats(history)
+        avg_xg, opponent_elo_norm = _league_context(elo_data, understat_data)
+        rows = []
+        for mgr in managers:
+            mgr_id = mgr.get("entry") or mgr.get("manager_id")
+            if not mgr_id:
+                continue
+            row = self._compute_manager_features(
+                mgr_id, mgr, history_stats.get(str(mgr_id)), avg_xg, opponent_elo_norm, now,
+            )
+            if row:
+                rows.append(row)
+        return rows
+
+    def _compute_manager_features(
+        self,
+        manager_id,
+        standing: Dict,
+        stats: Optional[tuple],
+        avg_xg: float,
+        opponent_elo_norm: float,
+        now: str,
+    ) -> Optional[tuple]:
+        """Compute one manager's feature row, in ``FEATURE_COLUMNS`` order."""
         try:
-            history = await self._get_manager_history(manager_id)
-            now = datetime.now(timezone.utc).isoformat()
+            form_5gw, total_transfers, transfer_cost, consistency_score = stats or (0.0, 0, 0, 0.0)
 
             # Basic standings features
             rank = _safe_int(standing.get("rank"), 0)
             total_pts = _safe_int(standing.get("total_points") or standing.get("total"), 0)
             event_pts = _safe_int(standing.get("event_total") or standing.get("event_points"), 0)
 
-            # Form (last 5 GWs from history)
-            form_5gw = 0.0
-            if history:
-                recent = history[-5:]
-                recent_pts = [_safe_int(h.get("points") or h.get("total_points"), 0) for h in recent]
-                form_5gw = sum(recent_pts) / max(len(recent_pts), 1)
-
             # Rank percentile (lower = better)
             total_entries = _safe_int(standing.get("total_entries"), 1) or 1
             rank_percentile = (rank - 1) / max(total_entries - 1, 1) if rank > 0 else 0.5
 
-            # Transfer efficiency
-            total_transfers = sum(_safe_int(h.get("event_transfers"), 0) for h in history) if history else 0
-            transfer_cost = sum(_safe_int(h.get("event_transfers_cost"), 0) for h in history) if history else 0
-
             # Points per transfer (higher = better)
             transfer_efficiency = total_pts / max(total_transfers, 1) if total_transfers > 0 else total_pts
 
@@ -190,94 +218,196 @@ class MLFeatureEngine:
             # Bench utilization (needs picks data)
             bench_utilization = 0.0
 
-            # Consistency (std dev of GW scores — lower is more consistent)
-            consistency_score = 0.0
-            if history and len(history) > 2:
-                pts_list = [_safe_int(h.get("points"), 0) for h in history]
-                mean_pts = sum(pts_list) / len(pts_list)
-                variance = sum((p - mean_pts) ** 2 for p in pts_list) / len(pts_list)
-                std_dev = variance ** 0.5
-                consistency_score = max(0, 1 - (std_dev / max(mean_pts, 1)))
-
-            # Team xG trend (average across EPL)
-            avg_xg = 0.0
-            if understat_data:
-                xg_values = [
-                    float(v.get("xg_per_match", 0))
-                    for v in understat_data.values()
-                    if v.get("xg_per_match")
-                ]
-                avg_xg = sum(xg_values) / max(len(xg_values), 1)
-
-            # Opponent Elo (normalized)
-            avg_elo = 0.0
-            if elo_data:
-                elo_vals = list(elo_data.values())
-                avg_elo = sum(elo_vals) / max(len(elo_vals), 1)
-            opponent_elo_norm = avg_elo / 2000 if avg_elo else 0.5
-
             # Normalize total points
             total_points_norm = min(total_pts / 2500, 1.0)  # 2500 is approx max possible
 
-            return {
-                "manager_id": str(manager_id),
-                "manager_name": standing.get("player_name", standing.get("entry_name", "")),
-                "rank": rank,
-                "total_points": total_pts,
-                "event_points": event_pts,
-                "form_5gw": round(form_5gw, 2),
-                "rank_percentile": round(rank_percentile, 4),
-                "total_points_norm": round(total_points_norm, 4),
-                "transfer_efficiency": round(transfer_efficiency, 2),
-                "total_transfers": total_transfers,
-                "transfer_cost": transfer_cost,
-                "captain_accuracy": round(captain_accuracy, 2),
-                "bench_utilization": round(bench_utilization, 2),
-                "consistency_score": round(consistency_score, 4),
-                "xg_team_trend": round(avg_xg, 2),
-                "opponent_elo_norm": round(opponent_elo_norm, 4),
-                "calculated_at": now,
-            }
+            return (
+                str(manager_id),
+                standing.get("player_name", standing.get("entry_name", "")),
+                rank,
+                total_pts,
+                event_pts,
+                round(form_5gw, 2),
+                round(rank_percentile, 4),
+                round(total_points_norm, 4),
+                round(transfer_efficiency, 2),
+                total_transfers,
+                transfer_cost,
+                round(captain_accuracy, 2),
+                round(bench_utilization, 2),
+                round(consistency_score, 4),
+                round(avg_xg, 2),
+                round(opponent_elo_norm, 4),
+                now,
+            )
         except Exception as exc:
             logger.debug("Feature calc failed for manager %s: %s", manager_id, exc)
             return None
 
     # ── LRI calculation ──────────────────────────────────────────────
 
-    def _calculate_lri(self, features: List[Dict]) -> List[Dict]:
-        """Calculate League Rating Index for each manager."""
-        lri_records = []
-        for feat in features:
-            score = 0.0
-            for field, weight in self.LRI_WEIGHTS.items():
-                val = feat.get(field, 0)
-                try:
-                    score += float(val) * weight
-                except (TypeError, ValueError):
-                    pass
-
-            lri_records.append({
-                "manager_id": feat["manager_id"],
-                "manager_name": feat.get("manager_name", ""),
-                "lri_score": round(score, 4),
-                "rank": feat.get("rank", 0),
-                "total_points": feat.get("total_points", 0),
-                "form_5gw": feat.get("form_5gw", 0),
-                "calculated_at": feat.get("calculated_at", ""),
-            })
-
-        # Sort by LRI descending and add LRI rank
-        lri_records.sort(key=lambda r: r["lri_score"], reverse=True)
-        for i, r in enumerate(lri_records, 1):
-            r["lri_rank"] = i
-
-        return lri_records
+    def _calculate_lri(self, columns: Dict[str, Sequence]) -> List[Dict]:
+        """Calculate League Rating Index for each manager from feature columns."""
+        ids = columns.get("manager_id", ())
+        n = len(ids)
+        if not n:
+            return []
+        zeros = (0,) * n
+        matrix = np.array([columns.get(f, zeros) for f in self._LRI_FIELDS], dtype=np.float64)
+        scores = [round(s, 4) for s in _lri_kernel(matrix, self._LRI_WEIGHTS_VEC).tolist()]
+
+        names = columns.get("manager_name", ("",) * n)
+        ranks = columns.get("rank", zeros)
+        points = columns.get("total_points", zeros)
+        form = columns.get("form_5gw", zeros)
+        stamps = columns.get("calculated_at", ("",) * n)
+
+        # Sort by LRI descending (ties keep input order) and add LRI rank
+        order = np.argsort(-np.array(scores), kind="stable")
+        return [
+            {
+                "manager_id": ids[idx],
+                "manager_name": names[idx],
+                "lri_score": scores[idx],
+                "rank": ranks[idx],
+                "total_points": points[idx],
+                "form_5gw": form[idx],
+                "calculated_at": stamps[idx],
+                "lri_rank": i,
+            }
+            for i, idx in enumerate(order.tolist(), 1)
+        ]
+
+
+def _lri_kernel(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted sums over a fields x managers matrix, accumulated field by
+    field in the same order as the old per-record loop.
+    """
+    scores = np.zeros(matrix.shape[1])
+    for j in range(matrix.shape[0]):
+        scores += matrix[j] * weights[j]
+    return scores
+
+
+if njit is not None:
+    _lri_kernel = njit(cache=True)(_lri_kernel)
+
+
+def _history_stats(history: List[Dict]) -> Dict[str, tuple]:
+    """
+    Per-manager history features, computed for all managers at once.
+
+    Returns ``str(manager_id) -> (form_5gw, total_transfers, transfer_cost,
+    consistency_score)``.  *history* must list each manager's rows in GW
+    order; groups are formed over manager codes (a Numba kernel, or
+    ``np.bincount`` without numba) rather than a Python loop per manager.
+    """
+    if not history:
+        return {}
+    n = len(history)
+    keys, codes = np.unique([str(h.get("manager_id")) for h in history], return_inverse=True)
+    k = len(keys)
+    points = np.fromiter((_safe_int(h.get("points"), 0) for h in history), dtype=np.float64, count=n)
+    form_pts = np.fromiter(
+        (_safe_int(h.get("points") or h.get("total_points"), 0) for h in history),
+        dtype=np.float64, count=n,
+    )
+    transfers = np.fromiter((_safe_int(h.get("event_transfers"), 0) for h in history), dtype=np.float64, count=n)
+    cost = np.fromiter((_safe_int(h.get("event_transfers_cost"), 0) for h in history), dtype=np.float64, count=n)
+
+    counts = np.bincount(codes, minlength=k)
+    # A stable sort keeps GW order inside each manager's run of rows.
+    order = np.argsort(codes, kind="stable")
+
+    if njit is not None:
+        starts = np.cumsum(counts) - counts
+        form, consistency = _form_consistency(points[order], form_pts[order], starts, counts)
+    else:
+        # Form: a row's distance from its group end is its age in GWs.
+        sorted_codes = codes[order]
+        age = np.cumsum(counts)[sorted_codes] - np.arange(n)
+        recent = age <= 5
+        form = np.bincount(sorted_codes[recent], weights=form_pts[order][recent], minlength=k)
+        form /= np.minimum(counts, 5)
+
+        # Consistency: 1 - coefficient of variation of GW points (needs > 2 GWs)
+        mean = np.bincount(codes, weights=points, minlength=k) / counts
+        std = np.sqrt(np.bincount(codes, weights=(points - mean[codes]) ** 2, minlength=k) / counts)
+        consistency = np.where(counts > 2, np.maximum(0, 1 - std / np.maximum(mean, 1)), 0.0)
+
+    total_transfers = np.bincount(codes, weights=transfers, minlength=k).astype(np.int64)
+    transfer_cost = np.bincount(codes, weights=cost, minlength=k).astype(np.int64)
+    return dict(zip(keys.tolist(), zip(
+        form.tolist(), total_transfers.tolist(), transfer_cost.tolist(), consistency.tolist(),
+    )))
+
+
+def _form_consistency(points, form_pts, starts, counts):
+    """
+    ``(form_5gw, consistency)`` per manager over contiguous runs of rows.
+
+    Only used compiled: one fused pass per manager instead of the several
+    whole-array passes of the NumPy path in ``_history_stats``.
+    """
+    k = counts.shape[0]
+    form = np.empty(k)
+    consistency = np.zeros(k)
+    for g in range(k):
+        start, n = starts[g], counts[g]
+        end = start + n
+        recent = min(n, 5)
+        acc = 0.0
+        for i in range(end - recent, end):
+            acc += form_pts[i]
+        form[g] = acc / recent
+        if n > 2:
+            mean = 0.0
+            for i in range(start, end):
+                mean += points[i]
+            mean /= n
+            var = 0.0
+            for i in range(start, end):
+                var += (points[i] - mean) ** 2
+            std = np.sqrt(var / n)
+            consistency[g] = max(0.0, 1 - std / max(mean, 1.0))
+    return form, consistency
+
+
+if njit is not None:
+    _form_consistency = njit(cache=True)(_form_consistency)
+
+
+def _league_context(elo_data: Dict, understat_data: Dict) -> tuple:
+    """League-wide ``(avg_xg, opponent_elo_norm)``, identical for every manager."""
+    # Team xG trend (average across EPL)
+    avg_xg = 0.0
+    if understat_data:
+        xg_values = [
+            float(v.get("xg_per_match", 0))
+            for v in understat_data.values()
+            if v.get("xg_per_match")
+        ]
+        avg_xg = sum(xg_values) / max(len(xg_values), 1)
+
+    # Opponent Elo (normalized)
+    avg_elo = 0.0
+    if elo_data:
+        elo_vals = list(elo_data.values())
+        avg_elo = sum(elo_vals) / max(len(elo_vals), 1)
+    return avg_xg, (avg_elo / 2000 if avg_elo else 0.5)
 
 
 def _safe_int(val, default: int = 0) -> int:
+    if type(val) is int:
+        return val
     if val is None:
         return default
     try:
-        return int(float(val))
+        return int(val)  # "60", 60.9
+    except (ValueError, TypeError):
+        pass
+    try:
+        return int(float(val))  # "60.0", "1e3"
     except (ValueError, TypeError):
         return default
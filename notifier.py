@@ -1,16 +1,38 @@
 """Telegram notification sender."""
 
+import asyncio
 import aiohttp
 import logging
+from typing import Optional
+
+from utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class TelegramNotifier:
     def __init__(self, token: str, chat_id: str):
         self.token = token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{token}"
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """One keep-alive session for the notifier's lifetime, opened on first send."""
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75),
+                )
+            return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def send_message(self, text: str, silent: bool = False) -> bool:
         url = f"{self.base_url}/sendMessage"
@@ -21,11 +43,14 @@ class TelegramNotifier:
             "disable_notification": silent,
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        return True
-                    logger.error("Telegram send failed: HTTP %d", resp.status)
+            session = await self._get_session()
+            async with session.post(
+                url, data=json_dumps(payload), headers=_JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                if resp.status == 200:
+                    return True
+                logger.error("Telegram send failed: HTTP %d", resp.status)
         except Exception as exc:
             logger.error("Telegram exception: %s", exc)
         return False
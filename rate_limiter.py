@@ -18,10 +18,15 @@ class AdaptiveRateLimiter:
         self.current_delay = self.base_delay
         self.last_request_time = 0.0
         self.success_history: deque = deque(maxlen=self.success_window)
+        self._success_count = 0  # running sum of success_history
         self.consecutive_errors = 0
         self.lock = asyncio.Lock()
+        # Cleared while a 429 Retry-After is being honoured, pausing every request
+        self._green = asyncio.Event()
+        self._green.set()
 
     async def wait_if_needed(self) -> None:
+        await self._green.wait()
         async with self.lock:
             now = time.time()
             elapsed = now - self.last_request_time
@@ -30,7 +35,10 @@ class AdaptiveRateLimiter:
             self.last_request_time = time.time()
 
     def update_delay(self, success: bool) -> None:
+        if len(self.success_history) == self.success_window:
+            self._success_count -= self.success_history[0]  # about to be evicted
         self.success_history.append(1 if success else 0)
+        self._success_count += 1 if success else 0
 
         if not success:
             self.consecutive_errors += 1
@@ -38,7 +46,7 @@ class AdaptiveRateLimiter:
         else:
             self.consecutive_errors = 0
             if len(self.success_history) == self.success_window:
-                rate = sum(self.success_history) / self.success_window
+                rate = self._success_count / self.success_window
                 if rate > 0.95:
                     self.current_delay = max(self.current_delay / 1.2, self.min_delay)
                 elif rate < self.error_threshold:
@@ -47,3 +55,30 @@ class AdaptiveRateLimiter:
         # Jitter
         jitter = random.uniform(0.9, 1.1)
         self.current_delay = max(self.min_delay, min(self.current_delay * jitter, self.max_delay))
+
+    async def pause(self, seconds: float) -> None:
+        """Hold back every request for *seconds*, e.g. a 429's ``Retry-After``.
+
+        The first caller of a burst sleeps for the whole pause; calls made while
+        it is running just wait for it to end.
+        """
+        if not self._green.is_set():
+            await self._green.wait()
+            return
+        self._green.clear()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self._green.set()
+
+    def update_from_response(self, status: int, headers) -> None:
+        """Record one HTTP response, letting rate-limit headers steer the delay.
+
+        An exhausted ``X-RateLimit-Remaining`` backs off before the server
+        starts answering 429; ``Retry-After`` itself is honoured via ``pause``.
+        Only 429 and 5xx count as failures; a 404 (e.g. picks for a gameweek
+        the manager did not play) is a normal answer.
+        """
+        self.update_delay(status != 429 and status < 500)
+        if headers.get("X-RateLimit-Remaining") == "0":
+            self.current_delay = min(self.current_delay * self.backoff_factor, self.max_delay)
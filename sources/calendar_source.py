@@ -16,13 +16,15 @@ Config example::
           mode: overwrite
 """
 
+import asyncio
 import aiohttp
 import logging
 from typing import List, Dict, Any
 from datetime import datetime, timezone
 
 from core.base import DataSource
-from storage.sqlite_storage import SQLiteStorage
+from utils import json_loads
+from storage.sqlite_storage import get_sqlite_storage
 
 logger = logging.getLogger(__name__)
 
@@ -50,14 +52,18 @@ class CalendarSource(DataSource):
         self.fpl_fixtures_url = "https://fantasy.premierleague.com/api/fixtures/"
 
     def _build_storage(self, config, global_config):
+        """Return ``(storage, breaks_cfg, fixtures_cfg)`` per sqlite target."""
+        targets = [
+            st for st in config.get("storage", [{"table": "raw_calendar", "type": "sqlite", "mode": "overwrite"}])
+            if st and st.get("type") == "sqlite"
+        ] or [{"table": "raw_calendar", "type": "sqlite", "mode": "overwrite"}]
         items = []
-        for st in config.get("storage", [{"table": "raw_calendar", "type": "sqlite", "mode": "overwrite"}]):
-            if st and st.get("type") == "sqlite":
-                items.append((SQLiteStorage(global_config["default_storage"]["path"]), st))
-        if not items:
+        for st in targets:
+            table = st.get("table", "raw_calendar")
             items.append((
-                SQLiteStorage(global_config["default_storage"]["path"]),
-                {"table": "raw_calendar", "type": "sqlite", "mode": "overwrite"},
+                get_sqlite_storage(global_config["default_storage"]["path"]),
+                {**st, "table": table},
+                {**st, "table": f"{table}_fixtures"},
             ))
         return items
 
@@ -66,14 +72,14 @@ class CalendarSource(DataSource):
         logger.info("Calendar: fetching FPL fixtures")
         fixtures = None
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._http_session() as session:
                 async with session.get(
                     self.fpl_fixtures_url,
                     timeout=aiohttp.ClientTimeout(total=30),
                     headers={"Accept": "application/json"},
                 ) as resp:
                     if resp.status == 200:
-                        fixtures = await resp.json()
+                        fixtures = json_loads(await resp.read())
         except Exception as exc:
             logger.warning("Calendar: fixtures fetch failed: %s", exc)
         return fixtures
@@ -81,6 +87,8 @@ class CalendarSource(DataSource):
     async def parse(self, raw_data: Any) -> List[Dict]:
         records = []
         now = datetime.now(timezone.utc)
+        fetched_at = now.isoformat()
+        today = now.strftime("%Y-%m-%d")
 
         # International breaks
         all_breaks = INTERNATIONAL_BREAKS_2024_25 + INTERNATIONAL_BREAKS_2025_26
@@ -90,15 +98,14 @@ class CalendarSource(DataSource):
                 "name": brk["name"],
                 "start_date": brk["start"],
                 "end_date": brk["end"],
-                "is_active": brk["start"] <= now.strftime("%Y-%m-%d") <= brk["end"],
-                "fetched_at": now.isoformat(),
+                "is_active": brk["start"] <= today <= brk["end"],
+                "fetched_at": fetched_at,
             })
 
         # Fixtures (if available)
         if raw_data and isinstance(raw_data, list):
-            for fix in raw_data:
-                kickoff = fix.get("kickoff_time")
-                records.append({
+            records.extend([
+                {
                     "record_type": "fixture",
                     "fixture_id": fix.get("id"),
                     "event": fix.get("event"),  # gameweek
@@ -106,10 +113,12 @@ class CalendarSource(DataSource):
                     "away_team_id": fix.get("team_a"),
                     "home_score": fix.get("team_h_score"),
                     "away_score": fix.get("team_a_score"),
-                    "kickoff_time": kickoff,
+                    "kickoff_time": fix.get("kickoff_time"),
                     "finished": fix.get("finished", False),
-                    "fetched_at": now.isoformat(),
-                })
+                    "fetched_at": fetched_at,
+                }
+                for fix in raw_data
+            ])
 
         logger.info("Calendar: %d records (breaks + fixtures)", len(records))
         return records
@@ -121,9 +130,10 @@ class CalendarSource(DataSource):
         breaks = [r for r in records if r.get("record_type") == "international_break"]
         fixtures = [r for r in records if r.get("record_type") == "fixture"]
 
-        for storage, st_cfg in self.storage_items:
-            table = st_cfg.get("table", "raw_calendar")
+        coros = []
+        for storage, breaks_cfg, fixtures_cfg in self.storage_items:
             if breaks:
-                await storage.store(breaks, {**st_cfg, "table": table})
+                coros.append(storage.store(breaks, breaks_cfg))
             if fixtures:
-                await storage.store(fixtures, {**st_cfg, "table": f"{table}_fixtures"})
+                coros.append(storage.store(fixtures, fixtures_cfg))
+        await asyncio.gather(*coros)
@@ -16,13 +16,16 @@ Config example in config.yaml::
           mode: overwrite
 """
 
+import asyncio
 import aiohttp
+import csv
+import io
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
 from core.base import DataSource
-from storage.sqlite_storage import SQLiteStorage
+from storage.sqlite_storage import get_sqlite_storage
 
 logger = logging.getLogger(__name__)
 
@@ -63,10 +66,10 @@ class EloSource(DataSource):
         items = []
         for st in config.get("storage", [{"table": "raw_team_elo", "type": "sqlite", "mode": "overwrite"}]):
             if st and st.get("type") == "sqlite":
-                items.append((SQLiteStorage(global_config["default_storage"]["path"]), st))
+                items.append((get_sqlite_storage(global_config["default_storage"]["path"]), st))
         if not items:
             items.append((
-                SQLiteStorage(global_config["default_storage"]["path"]),
+                get_sqlite_storage(global_config["default_storage"]["path"]),
                 {"table": "raw_team_elo", "type": "sqlite", "mode": "overwrite"},
             ))
         return items
@@ -77,7 +80,7 @@ class EloSource(DataSource):
         url = f"{self.url.rstrip('/')}/{today}"
         logger.info("Elo: fetching %s", url)
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._http_session() as session:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
                     if resp.status == 200:
                         return await resp.text()
@@ -91,7 +94,7 @@ class EloSource(DataSource):
         """Fallback: scrape the HTML table."""
         url = "http://clubelo.com/ENG"
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._http_session() as session:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
                     if resp.status == 200:
                         return ("html", await resp.text())
@@ -116,50 +119,73 @@ class EloSource(DataSource):
     def _parse_csv(self, text: str) -> List[Dict]:
         """Parse the clubelo CSV format: Rank,Club,Country,Level,Elo,From,To"""
         teams = []
-        lines = text.strip().split("\n")
-        for line in lines:
-            parts = line.split(",")
-            if len(parts) < 5:
-                continue
-            club = parts[1].strip()
-            country = parts[2].strip()
-            if country != "ENG":
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        to_fpl = ELO_TO_FPL.get
+        for row in csv.reader(io.StringIO(text.strip())):
+            if len(row) < 5 or row[2].strip() != "ENG":
                 continue
+            club = row[1].strip()
             try:
-                elo = round(float(parts[4].strip()))
-            except (ValueError, IndexError):
+                elo = round(float(row[4]))
+            except ValueError:
                 continue
-            fpl_name = ELO_TO_FPL.get(club, club)
             teams.append({
                 "team": club,
-                "team_fpl": fpl_name,
+                "team_fpl": to_fpl(club, club),
                 "elo": elo,
                 "rank": len(teams) + 1,
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
+                "fetched_at": fetched_at,
             })
         logger.info("Elo: parsed %d English teams from CSV", len(teams))
         return teams
 
-    def _parse_html(self, html: str) -> List[Dict]:
-        """Fallback HTML parsing."""
+    @staticmethod
+    def _html_rows(html: str) -> Optional[List[List[str]]]:
+        """
+        Cell texts of rows 2–21 of the first ``<table>``.
+
+        Uses selectolax (C parser) when installed, otherwise BeautifulSoup's
+        pure-Python parser.  Returns ``None`` when neither is available.
+        """
+        try:
+            from selectolax.parser import HTMLParser
+        except ImportError:
+            HTMLParser = None
+        if HTMLParser is not None:
+            table = HTMLParser(html).css_first("table")
+            if table is None:
+                return []
+            return [
+                [td.text(strip=True) for td in row.css("td")]
+                for row in table.css("tr")[1:21]
+            ]
+
         try:
             from bs4 import BeautifulSoup
         except ImportError:
-            logger.error("beautifulsoup4 required for Elo HTML parsing")
+            return None
+        table = BeautifulSoup(html, "html.parser").find("table")
+        if not table:
             return []
+        return [
+            [td.get_text(strip=True) for td in row.find_all("td")]
+            for row in table.find_all("tr")[1:21]
+        ]
 
-        teams = []
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table")
-        if not table:
+    def _parse_html(self, html: str) -> List[Dict]:
+        """Fallback HTML parsing."""
+        rows = self._html_rows(html)
+        if rows is None:
+            logger.error("selectolax or beautifulsoup4 required for Elo HTML parsing")
             return []
-        rows = table.find_all("tr")[1:21]
-        for row in rows:
-            cols = row.find_all("td")
+
+        teams = []
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        for cols in rows:
             if len(cols) >= 4:
-                rank = cols[0].get_text(strip=True)
-                team = cols[1].get_text(strip=True)
-                elo_text = cols[2].get_text(strip=True) if len(cols) > 2 else "0"
+                rank = cols[0]
+                team = cols[1]
+                elo_text = cols[2]
                 try:
                     elo = int(float(elo_text))
                     rank_int = int(rank) if rank.isdigit() else len(teams) + 1
@@ -171,7 +197,7 @@ class EloSource(DataSource):
                     "team_fpl": fpl_name,
                     "elo": elo,
                     "rank": rank_int,
-                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                    "fetched_at": fetched_at,
                 })
         logger.info("Elo: parsed %d teams from HTML", len(teams))
         return teams
@@ -184,5 +210,6 @@ class EloSource(DataSource):
         return records
 
     async def store(self, records: List[Dict]) -> None:
-        for storage, st_cfg in self.storage_items:
-            await storage.store(records, st_cfg)
+        await asyncio.gather(*(
+            storage.store(records, st_cfg) for storage, st_cfg in self.storage_items
+        ))
@@ -20,16 +20,34 @@ Config example::
 """
 
 import aiohttp
+import codecs
+import csv
+import io
 import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; the csv module is used instead
+    pa = None
+
 from core.base import DataSource
-from storage.sqlite_storage import SQLiteStorage
+from storage.sqlite_storage import get_sqlite_storage
 
 logger = logging.getLogger(__name__)
 
+_READ_CHUNK = 64 * 1024
+
+# Columns stored as floats; everything else stays text
+NUMERIC_FIELDS = (
+    "minutes", "goals_scored", "assists", "clean_sheets",
+    "goals_conceded", "bonus", "bps", "influence", "creativity",
+    "threat", "ict_index", "total_points", "xg", "xa", "xgi",
+)
+
 
 class FCISource(DataSource):
     def __init__(self, config: dict, global_config: dict, rate_limiter=None, session_pool=None):
@@ -43,10 +61,10 @@ class FCISource(DataSource):
         items = []
         for st in config.get("storage", [{"table": "raw_fci_stats", "type": "sqlite", "mode": "overwrite"}]):
             if st and st.get("type") == "sqlite":
-                items.append((SQLiteStorage(global_config["default_storage"]["path"]), st))
+                items.append((get_sqlite_storage(global_config["default_storage"]["path"]), st))
         if not items:
             items.append((
-                SQLiteStorage(global_config["default_storage"]["path"]),
+                get_sqlite_storage(global_config["default_storage"]["path"]),
                 {"table": "raw_fci_stats", "type": "sqlite", "mode": "overwrite"},
             ))
         return items
@@ -56,10 +74,12 @@ class FCISource(DataSource):
         if self.csv_url:
             logger.info("FCI: downloading from %s", self.csv_url)
             try:
-                async with aiohttp.ClientSession() as session:
+                async with self._http_session() as session:
                     async with session.get(self.csv_url, timeout=aiohttp.ClientTimeout(total=60)) as resp:
                         if resp.status == 200:
-                            return await resp.text()
+                            if pa is not None and (resp.charset or "utf-8").lower() in ("utf-8", "utf8"):
+                                return await resp.read()
+                            return await self._read_lines(resp)
                         logger.warning("FCI URL returned %d", resp.status)
             except Exception as exc:
                 logger.error("FCI download failed: %s", exc)
@@ -67,37 +87,101 @@ class FCISource(DataSource):
         # Fallback to local file
         if os.path.exists(self.csv_path):
             logger.info("FCI: reading local file %s", self.csv_path)
+            if pa is not None:
+                with open(self.csv_path, "rb") as f:
+                    # Same universal-newline translation as reading in text mode
+                    return f.read().replace(b"\r\n", b"\n").replace(b"\r", b"\n")
             with open(self.csv_path, "r", encoding="utf-8") as f:
-                return f.read()
+                return f.readlines()
 
         logger.warning("FCI: no data source available (no URL or local file)")
         return None
 
+    @staticmethod
+    async def _read_lines(resp: aiohttp.ClientResponse) -> List[str]:
+        """
+        Decode the CSV body chunk by chunk into lines (endings kept for csv).
+
+        Avoids holding the whole body as bytes and as one large str at once.
+        """
+        decoder = codecs.getincrementaldecoder(resp.charset or "utf-8")()
+        lines: List[str] = []
+        tail = ""
+        async for chunk in resp.content.iter_chunked(_READ_CHUNK):
+            parts = (tail + decoder.decode(chunk)).split("\n")
+            tail = parts.pop()
+            lines.extend(p + "\n" for p in parts)
+        tail += decoder.decode(b"", final=True)
+        if tail:
+            lines.append(tail)
+        return lines
+
     async def parse(self, raw_data: Any) -> List[Dict]:
         if not raw_data:
             return []
-        import csv
-        from io import StringIO
-        reader = csv.DictReader(StringIO(raw_data))
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        if isinstance(raw_data, bytes):
+            records = self._parse_arrow(raw_data, fetched_at)
+            if records is not None:
+                logger.info("FCI: parsed %d player-gameweek records", len(records))
+                return records
+            raw_data = raw_data.decode("utf-8")
+        lines = io.StringIO(raw_data) if isinstance(raw_data, str) else raw_data
         records = []
-        for row in reader:
-            row["fetched_at"] = datetime.now(timezone.utc).isoformat()
+        for row in csv.DictReader(lines):
+            row["fetched_at"] = fetched_at
             records.append(row)
         logger.info("FCI: parsed %d player-gameweek records", len(records))
         return records
 
+    @staticmethod
+    def _parse_arrow(raw: bytes, fetched_at: str) -> Optional[List[Dict]]:
+        """
+        Parse and type the CSV in one vectorised pass with pyarrow.
+
+        Numeric columns come back as floats (empty cells as "" like the csv
+        path), all others as text.  Returns ``None`` when the file does not
+        fit that schema (e.g. a non-numeric value in a numeric column, or a
+        row with missing or extra values), so the caller can fall back to the
+        csv module.  Files with a BOM also fall back, since the csv module
+        keeps it in the first column name.
+        """
+        if raw.startswith(codecs.BOM_UTF8):
+            return None
+        header = next(csv.reader([raw.split(b"\n", 1)[0].decode("utf-8")]), None)
+        if not header:
+            return []
+        numeric = set(NUMERIC_FIELDS)
+        convert = pa_csv.ConvertOptions(
+            column_types={c: pa.float64() if c in numeric else pa.string() for c in header},
+            null_values=[""],  # Arrow's default set would also swallow "n/a", "NULL", ...
+        )
+        try:
+            table = pa_csv.read_csv(
+                pa.BufferReader(raw),
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                convert_options=convert,
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+            logger.info("FCI: falling back to csv module: %s", exc)
+            return None
+        table = table.append_column("fetched_at", pa.array([fetched_at] * table.num_rows, pa.string()))
+        records = table.to_pylist()
+        for name in table.column_names:
+            if table.column(name).null_count:
+                for rec in records:
+                    if rec[name] is None:
+                        rec[name] = ""
+        return records
+
     async def transform(self, records: List[Dict]) -> List[Dict]:
-        # Ensure numeric columns
-        numeric_fields = [
-            "minutes", "goals_scored", "assists", "clean_sheets",
-            "goals_conceded", "bonus", "bps", "influence", "creativity",
-            "threat", "ict_index", "total_points", "xg", "xa", "xgi",
-        ]
+        # Ensure numeric columns (already floats when pyarrow parsed the file)
         for rec in records:
-            for f in numeric_fields:
-                if f in rec and rec[f] is not None:
+            for f in NUMERIC_FIELDS:
+                v = rec.get(f)
+                if v is not None and type(v) is not float:
                     try:
-                        rec[f] = float(rec[f])
+                        rec[f] = float(v)
                     except (ValueError, TypeError):
                         pass
         return records
@@ -8,15 +8,21 @@ Handles config-driven fetching for any FPL API endpoint:
   - manager picks & transfers
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional
+
+import aiohttp
 
 from core.base import DataSource
 from core.fetcher import HttpFetcher
 from core.parser import JsonParser
 from core.transformer import Transformer
-from storage.sqlite_storage import SQLiteStorage
-from storage.file_storage import FileStorage
+from rate_limiter import AdaptiveRateLimiter
+from storage.sqlite_storage import get_sqlite_storage
+from storage.file_storage import get_file_storage
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +40,6 @@ class FPLSource(DataSource):
         self.fetcher = HttpFetcher(
             fetcher_cfg,
             rate_limiter,
-            session_pool,
             global_config["network"].get("proxies", []),
             global_config["network"].get("user_agents", []),
             cache_dir=global_config["network"].get("cache_dir", "./cache"),
@@ -57,14 +62,17 @@ class FPLSource(DataSource):
                 continue
             stype = st_cfg.get("type", "sqlite")
             if stype == "sqlite":
-                storage = SQLiteStorage(global_config["default_storage"]["path"])
+                storage = get_sqlite_storage(global_config["default_storage"]["path"])
                 self.storage_items.append((storage, st_cfg))
             elif stype == "file":
-                storage = FileStorage(global_config["export"].get("csv_dir", "exports"))
+                storage = get_file_storage(global_config["export"].get("csv_dir", "exports"))
                 self.storage_items.append((storage, st_cfg))
             else:
                 logger.warning("Unknown storage type %s in source %s", stype, self.name)
 
+    async def close(self) -> None:
+        await self.fetcher.close()
+
     async def fetch(self) -> Any:
         params = self.config.get("fetcher", {}).get("params", {})
         logger.info("Source %s: fetching with params %s", self.name, params)
@@ -92,89 +100,180 @@ class FPLSource(DataSource):
                     self.name, st_cfg.get("table", "?"), exc,
                 )
 
-async def fetch_manager_history(manager_id: int) -> List[Dict]:
-    """Получить историю менеджера (entry/{id}/history/)"""
-    url = f"https://fantasy.premierleague.com/api/entry/{manager_id}/history/"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                return data.get('current', [])
-    return []
+FPL_API = "https://fantasy.premierleague.com/api"
 
-async def fetch_manager_picks(manager_id: int, event: int) -> List[Dict]:
-    """Получить состав менеджера на игровую неделю"""
-    url = f"https://fantasy.premierleague.com/api/entry/{manager_id}/event/{event}/picks/"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
+# Upper bound on in-flight requests in collect_league_history.  Throughput is
+# set by AdaptiveRateLimiter, which starts at most one request per
+# current_delay; this only lets those requests overlap while in flight.
+MANAGER_CONCURRENCY = 8
+
+# Retries of a URL answered with 429, each after waiting out its Retry-After.
+MAX_429_RETRIES = 3
+
+# Rows buffered per table before collect_league_history flushes to storage.
+HISTORY_BATCH = PICKS_BATCH = 10_000
+
+
+def fpl_session() -> aiohttp.ClientSession:
+    """Create a keep-alive session to share across many FPL helper calls."""
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=64, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector)
+
+
+@asynccontextmanager
+async def _session_scope(session: Optional[aiohttp.ClientSession]) -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield *session*, or a throwaway one when the caller did not pass any."""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as own:
+        yield own
+
+
+async def _get_json(sess: aiohttp.ClientSession, url: str, rate_limiter=None) -> Optional[Any]:
+    """GET *url* and decode JSON, or return None on a non-200 response.
+
+    When a rate limiter is given, the request waits for its slot and the
+    response status and rate-limit headers feed back into the adaptive delay.
+    A 429 pauses every request until its ``Retry-After`` has passed, then the
+    same URL is retried (up to ``MAX_429_RETRIES`` times).
+    """
+    for _ in range(MAX_429_RETRIES + 1):
+        if rate_limiter is not None:
+            await rate_limiter.wait_if_needed()
+        async with sess.get(url) as resp:
+            if rate_limiter is not None:
+                rate_limiter.update_from_response(resp.status, resp.headers)
             if resp.status == 200:
-                data = await resp.json()
-                return data.get('picks', [])
-    return []
+                return await resp.json()
+            if resp.status != 429:
+                return None
+            retry_after = resp.headers.get("Retry-After", "")
+        delay = int(retry_after) if retry_after.isdigit() else 60
+        logger.warning("429 rate-limit on %s, pausing requests for %ds", url, delay)
+        if rate_limiter is not None:
+            await rate_limiter.pause(delay)
+        else:
+            await asyncio.sleep(delay)
+    logger.error("Giving up on %s after %d rate-limited attempts", url, MAX_429_RETRIES + 1)
+    return None
+
+
+async def fetch_manager_history(manager_id: int, session: Optional[aiohttp.ClientSession] = None,
+                                rate_limiter=None) -> List[Dict]:
+    """Получить историю менеджера (entry/{id}/history/)"""
+    url = f"{FPL_API}/entry/{manager_id}/history/"
+    async with _session_scope(session) as sess:
+        data = await _get_json(sess, url, rate_limiter)
+    return data.get('current', []) if data else []
 
 # ----------------------------------------------------------------------
 # Добавленные функции для истории и составов (по запросу)
 # ----------------------------------------------------------------------
-import asyncio
-import aiohttp
 
-async def fetch_manager_full_history(manager_id: int) -> dict:
-    url = f"https://fantasy.premierleague.com/api/entry/{manager_id}/history/"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            return {}
+async def fetch_manager_full_history(manager_id: int, session: Optional[aiohttp.ClientSession] = None,
+                                     rate_limiter=None) -> dict:
+    url = f"{FPL_API}/entry/{manager_id}/history/"
+    async with _session_scope(session) as sess:
+        data = await _get_json(sess, url, rate_limiter)
+    return data or {}
 
-async def fetch_manager_picks(manager_id: int, event: int) -> list:
-    url = f"https://fantasy.premierleague.com/api/entry/{manager_id}/event/{event}/picks/"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                picks = data.get('picks', [])
-                for p in picks:
-                    p['manager_id'] = manager_id
-                    p['event'] = event
-                return picks
-            return []
+async def fetch_manager_picks(manager_id: int, event: int, session: Optional[aiohttp.ClientSession] = None,
+                              rate_limiter=None) -> list:
+    """Получить состав менеджера на игровую неделю"""
+    url = f"{FPL_API}/entry/{manager_id}/event/{event}/picks/"
+    async with _session_scope(session) as sess:
+        data = await _get_json(sess, url, rate_limiter)
+    if not data:
+        return []
+    picks = data.get('picks', [])
+    for p in picks:
+        p['manager_id'] = manager_id
+        p['event'] = event
+    return picks
+
+async def _collect_manager(mid: int, session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                           rate_limiter) -> tuple:
+    """Fetch one manager's history and every gameweek's picks; return ``(history, picks)``."""
+    async with sem:
+        hist = await fetch_manager_full_history(mid, session, rate_limiter)
+    history, picks = [], []
+    if not hist:
+        return history, picks
+    current = hist.get('current', [])
+    for gw in current:
+        gw['manager_id'] = mid
+        history.append(gw)
+    for chip in hist.get('chips', []):
+        chip['manager_id'] = mid
+        chip['chip_name'] = chip.get('name')
+        history.append(chip)
+
+    async def _picks(event: int) -> list:
+        async with sem:
+            return await fetch_manager_picks(mid, event, session, rate_limiter)
+
+    for p in await asyncio.gather(*(_picks(gw['event']) for gw in current)):
+        picks.extend(p)
+    return history, picks
+
+def _league_manager_ids(db_path: str, league_id: int) -> List[int]:
+    """Distinct manager ids stored in ``league_standings_<league_id>``."""
+    league_id = int(league_id)  # table names cannot be bound as parameters
+    conn = sqlite3.connect(db_path)
+    try:
+        return [mid for (mid,) in conn.execute(f'SELECT DISTINCT manager_id FROM "league_standings_{league_id}"')]
+    finally:
+        conn.close()
 
 async def collect_league_history(league_id: int):
-    import sqlite3
-    from storage.sqlite_storage import SQLiteStorage
     from core.config import get_config
 
     config = get_config()
-    storage = SQLiteStorage(config["default_storage"]["path"])
+    storage = get_sqlite_storage(config["default_storage"]["path"])
 
-    conn = sqlite3.connect(config["default_storage"]["path"])
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT DISTINCT manager_id FROM league_standings_{league_id}")
-    managers = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    managers = await asyncio.to_thread(_league_manager_ids, config["default_storage"]["path"], league_id)
 
-    print(f"Сбор истории для {len(managers)} менеджеров")
+    logger.info("League %s: collecting history for %d managers", league_id, len(managers))
+    progress_every = max(1, len(managers) // 20)
+    history_cfg = {"table": "raw_manager_history", "mode": "append"}
+    picks_cfg = {"table": "raw_manager_picks", "mode": "append"}
     history = []
     picks = []
+    n_history = n_picks = 0
 
-    for mid in managers:
-        hist = await fetch_manager_full_history(mid)
-        if hist:
-            for gw in hist.get('current', []):
-                gw['manager_id'] = mid
-                history.append(gw)
-            for chip in hist.get('chips', []):
-                chip['manager_id'] = mid
-                chip['chip_name'] = chip.get('name')
-                history.append(chip)
-            for gw in hist.get('current', []):
-                event = gw['event']
-                p = await fetch_manager_picks(mid, event)
+    rate_limiter = AdaptiveRateLimiter(config.get("rate_limiter", {}))
+    sem = asyncio.Semaphore(MANAGER_CONCURRENCY)
+    async with fpl_session() as session:
+        tasks = [
+            asyncio.create_task(_collect_manager(mid, session, sem, rate_limiter))
+            for mid in managers
+        ]
+        try:
+            for n_done, done in enumerate(asyncio.as_completed(tasks), 1):
+                h, p = await done
+                if n_done % progress_every == 0:
+                    logger.info("League %s: %d/%d managers collected", league_id, n_done, len(managers))
+                history.extend(h)
                 picks.extend(p)
-        await asyncio.sleep(0.5)
+                if len(history) >= HISTORY_BATCH:
+                    await storage.store(history, history_cfg)
+                    n_history += len(history)
+                    history.clear()
+                if len(picks) >= PICKS_BATCH:
+                    await storage.store(picks, picks_cfg)
+                    n_picks += len(picks)
+                    picks.clear()
+        finally:
+            # On error, stop the remaining managers before the session closes under them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     if history:
-        await storage.store(history, {"table": "raw_manager_history", "mode": "append"})
+        await storage.store(history, history_cfg)
+        n_history += len(history)
     if picks:
-        await storage.store(picks, {"table": "raw_manager_picks", "mode": "append"})
-    print(f"Сохранено: история {len(history)}, составы {len(picks)}")
+        await storage.store(picks, picks_cfg)
+        n_picks += len(picks)
+    logger.info("League %s: stored %d history rows and %d picks", league_id, n_history, n_picks)
@@ -24,17 +24,52 @@ Config example::
 
 import aiohttp
 import asyncio
-import json
+import codecs
+import functools
 import re
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
+try:
+    import msgspec
+except ImportError:  # plain dict decoding via utils.json_loads is the fallback
+    msgspec = None
+
 from core.base import DataSource
-from storage.sqlite_storage import SQLiteStorage
+from storage.sqlite_storage import get_sqlite_storage
+from utils import json_loads, JSONDecodeError
 
 logger = logging.getLogger(__name__)
 
+# Inline variables parse() needs; fetch stops reading once each is closed.
+_PAYLOAD_MARKERS = (b"var teamsData", b"var datesData")
+_READ_CHUNK = 64 * 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _json_var_pattern(var_name: str) -> "re.Pattern[str]":
+    """Compiled matcher for ``var <var_name> = JSON.parse('...')``."""
+    return re.compile(rf"var\s+{re.escape(var_name)}\s*=\s*JSON\.parse\('(.+?)'\)", re.DOTALL)
+
+
+if msgspec is not None:
+    class _TeamMatch(msgspec.Struct):
+        """The slice of a ``teamsData`` history entry that ``_parse_teams`` reads."""
+        xG: float = 0.0
+        xGA: float = 0.0
+        scored: int = 0
+        missed: int = 0
+
+    class _Team(msgspec.Struct):
+        title: str = "Unknown"
+        history: List[_TeamMatch] = []
+
+    # strict=False accepts numeric strings, as the float()/int() casts did.
+    _TEAMS_DECODER = msgspec.json.Decoder(Dict[str, _Team], strict=False)
+else:
+    _TEAMS_DECODER = None
+
 
 class UnderstatSource(DataSource):
     """Scrape xG data from understat.com."""
@@ -52,10 +87,10 @@ class UnderstatSource(DataSource):
         items = []
         for st in config.get("storage", [{"table": "raw_understat_teams", "type": "sqlite", "mode": "overwrite"}]):
             if st and st.get("type") == "sqlite":
-                items.append((SQLiteStorage(global_config["default_storage"]["path"]), st))
+                items.append((get_sqlite_storage(global_config["default_storage"]["path"]), st))
         if not items:
             items.append((
-                SQLiteStorage(global_config["default_storage"]["path"]),
+                get_sqlite_storage(global_config["default_storage"]["path"]),
                 {"table": "raw_understat_teams", "type": "sqlite", "mode": "overwrite"},
             ))
         return items
@@ -70,51 +105,127 @@ class UnderstatSource(DataSource):
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
                     if resp.status == 200:
-                        return await resp.text()
+                        return await self._read_payloads(resp)
                     logger.warning("Understat returned %d for %s", resp.status, url)
         except Exception as exc:
             logger.error("Understat fetch failed: %s", exc)
         return None
 
+    @staticmethod
+    async def _read_payloads(resp: aiohttp.ClientResponse) -> str:
+        """Read the page only as far as the end of the last embedded payload.
+
+        Each marker is searched for only in newly arrived bytes, and so is its
+        closing ``')``; if a marker never shows up the whole body is read, so
+        the result is never shorter than what ``parse`` could have used.
+        """
+        buf = bytearray()
+        found: Dict[bytes, int] = {}
+        pending = list(_PAYLOAD_MARKERS)
+        async for chunk in resp.content.iter_chunked(_READ_CHUNK):
+            prev_len = len(buf)
+            buf += chunk
+            for marker in list(pending):
+                at = found.get(marker)
+                if at is None:
+                    at = buf.find(marker, max(0, prev_len - len(marker) + 1))
+                    if at < 0:
+                        continue
+                    found[marker] = at
+                if buf.find(b"')", max(at + len(marker), prev_len - 1)) >= 0:
+                    pending.remove(marker)
+            if not pending:
+                break
+        return buf.decode(resp.charset or "utf-8", errors="replace")
+
     async def parse(self, raw_data: Any) -> List[Dict]:
         if not raw_data or not isinstance(raw_data, str):
             return []
-        return self._parse_teams(raw_data) + self._parse_matches(raw_data)
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        return self._parse_teams(raw_data, fetched_at) + self._parse_matches(raw_data, fetched_at)
+
+    def _extract_json_text(self, html: str, var_name: str) -> Optional[str]:
+        """Return the decoded JSON text of an inline ``var X = JSON.parse('...')``."""
+        # Understat's own spacing lets two str.find calls stand in for the
+        # regex; the pattern still covers any other whitespace layout.
+        key = f"var {var_name} = JSON.parse('"
+        start = html.find(key)
+        end = html.find("')", start + len(key)) if start >= 0 else -1
+        if end > start + len(key):
+            encoded = html[start + len(key):end]
+        else:
+            match = _json_var_pattern(var_name).search(html)
+            if not match:
+                return None
+            encoded = match.group(1)
+        # Understat double-encodes: unicode escapes like \\x27
+        return codecs.decode(encoded, "unicode_escape")
 
     def _extract_json_var(self, html: str, var_name: str) -> Any:
         """Extract JSON data from an inline JS variable like ``var teamsData = JSON.parse('...')``."""
-        pattern = rf"var\s+{var_name}\s*=\s*JSON\.parse\('(.+?)'\)"
-        match = re.search(pattern, html)
-        if not match:
+        decoded = self._extract_json_text(html, var_name)
+        if decoded is None:
             return None
-        encoded = match.group(1)
-        # Understat double-encodes: unicode escapes like \\x27
-        decoded = encoded.encode("utf-8").decode("unicode_escape")
         try:
-            return json.loads(decoded)
-        except json.JSONDecodeError as exc:
+            return json_loads(decoded)
+        except JSONDecodeError as exc:
             logger.warning("Failed to parse %s JSON: %s", var_name, exc)
             return None
 
-    def _parse_teams(self, html: str) -> List[Dict]:
+    def _team_totals(self, html: str) -> Optional[List[tuple]]:
+        """Return ``(team_id, title, matches, xg, xga, goals, conceded)`` per team.
+
+        With msgspec installed only the four summed fields of each history
+        entry are decoded; anything it cannot validate falls back to dicts.
+        """
+        if _TEAMS_DECODER is not None:
+            decoded = self._extract_json_text(html, "teamsData")
+            if decoded is None:
+                return None
+            try:
+                teams = _TEAMS_DECODER.decode(decoded)
+            except msgspec.DecodeError as exc:
+                logger.debug("Understat: typed teamsData decode failed (%s), using dicts", exc)
+            else:
+                totals = []
+                for team_id, info in teams.items():
+                    xg = xga = 0.0
+                    goals = conceded = 0
+                    for m in info.history:
+                        xg += m.xG
+                        xga += m.xGA
+                        goals += m.scored
+                        conceded += m.missed
+                    totals.append((team_id, info.title, len(info.history), xg, xga, goals, conceded))
+                return totals
+
         data = self._extract_json_var(html, "teamsData")
         if not data:
+            return None
+        totals = []
+        for team_id, info in data.items():
+            history = info.get("history", [])
+            xg = xga = 0.0
+            goals = conceded = 0
+            for m in history:
+                xg += float(m.get("xG", 0))
+                xga += float(m.get("xGA", 0))
+                goals += int(m.get("scored", 0))
+                conceded += int(m.get("missed", 0))
+            totals.append((team_id, info.get("title", "Unknown"), len(history), xg, xga, goals, conceded))
+        return totals
+
+    def _parse_teams(self, html: str, fetched_at: str) -> List[Dict]:
+        totals = self._team_totals(html)
+        if not totals:
             logger.warning("Understat: teamsData not found")
             return []
 
         teams = []
-        for team_id, info in data.items():
-            title = info.get("title", "Unknown")
-            history = info.get("history", [])
-            if not history:
+        for team_id, title, matches, total_xg, total_xga, total_goals, total_conceded in totals:
+            if not matches:
                 continue
 
-            total_xg = sum(float(m.get("xG", 0)) for m in history)
-            total_xga = sum(float(m.get("xGA", 0)) for m in history)
-            total_goals = sum(int(m.get("scored", 0)) for m in history)
-            total_conceded = sum(int(m.get("missed", 0)) for m in history)
-            matches = len(history)
-
             teams.append({
                 "record_type": "team",
                 "team": title,
@@ -129,13 +240,13 @@ class UnderstatSource(DataSource):
                 "xg_diff": round(total_xg - total_xga, 2),
                 "season": self.season,
                 "league": self.league,
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
+                "fetched_at": fetched_at,
             })
 
         logger.info("Understat: parsed %d teams", len(teams))
         return teams
 
-    def _parse_matches(self, html: str) -> List[Dict]:
+    def _parse_matches(self, html: str, fetched_at: str) -> List[Dict]:
         data = self._extract_json_var(html, "datesData")
         if not data:
             return []
@@ -156,7 +267,7 @@ class UnderstatSource(DataSource):
                     "is_result": match.get("isResult", False),
                     "season": self.season,
                     "league": self.league,
-                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                    "fetched_at": fetched_at,
                 })
             except Exception:
                 continue
@@ -169,8 +280,12 @@ class UnderstatSource(DataSource):
 
     async def store(self, records: List[Dict]) -> None:
         # Split by record_type for different tables
-        team_records = [r for r in records if r.get("record_type") == "team"]
-        match_records = [r for r in records if r.get("record_type") == "match"]
+        team_records, match_records = [], []
+        buckets = {"team": team_records.append, "match": match_records.append}
+        for r in records:
+            add = buckets.get(r.get("record_type"))
+            if add is not None:
+                add(r)
 
         for storage, st_cfg in self.storage_items:
             table = st_cfg.get("table", "raw_understat_teams")
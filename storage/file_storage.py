@@ -1,9 +1,12 @@
 """File-based storage (CSV, JSONL, Parquet)."""
 
+import csv
+import functools
 import os
 import logging
 from typing import List, Dict
 from core.storage import BaseStorage
+from utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -14,21 +17,51 @@ class FileStorage(BaseStorage):
         os.makedirs(base_path, exist_ok=True)
 
     async def store(self, records: List[Dict], source_config: Dict) -> None:
-        import pandas as pd
-
         fmt = source_config.get("format", "jsonl")
         table = source_config.get("table", "data")
         path = source_config.get("path", os.path.join(self.base_path, f"{table}.{fmt}"))
-        df = pd.DataFrame(records)
 
         if fmt == "csv":
-            df.to_csv(path, index=False)
+            self._write_csv(path, records)
         elif fmt == "jsonl":
-            df.to_json(path, orient="records", lines=True)
+            self._write_jsonl(path, records)
         elif fmt == "parquet":
-            df.to_parquet(path, index=False)
+            self._write_parquet(path, records)
         else:
             logger.warning("Unknown file format %s, using jsonl", fmt)
-            df.to_json(path + ".jsonl", orient="records", lines=True)
+            self._write_jsonl(path + ".jsonl", records)
 
         logger.info("Exported %d records to %s", len(records), path)
+
+    @staticmethod
+    def _write_jsonl(path: str, records: List[Dict]) -> None:
+        with open(path, "wb") as f:
+            f.writelines(json_dumps(r) + b"\n" for r in records)
+
+    @staticmethod
+    def _columns(records: List[Dict]) -> List[str]:
+        """Union of record keys in first-seen order, as a DataFrame would have."""
+        return list(dict.fromkeys(k for r in records for k in r))
+
+    @classmethod
+    def _write_csv(cls, path: str, records: List[Dict]) -> None:
+        fieldnames = cls._columns(records)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+
+    @classmethod
+    def _write_parquet(cls, path: str, records: List[Dict]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # from_pylist would take the schema from the first record only.
+        table = pa.Table.from_pydict({c: [r.get(c) for r in records] for c in cls._columns(records)})
+        pq.write_table(table, path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_file_storage(base_path: str) -> FileStorage:
+    """Shared FileStorage for *base_path*, one instance per directory."""
+    return FileStorage(base_path)
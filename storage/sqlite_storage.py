@@ -5,30 +5,58 @@ Fixes:
 - No longer skips table creation when first record is empty — skips empty records instead.
 - Auto-creates indexes on unique_columns.
 - INSERT OR REPLACE with proper unique constraints.
-- Thread-safe with connection-per-call pattern.
+- Thread-safe with connection-per-call pattern; all SQLite work runs off the event loop.
 """
 
+import asyncio
+import functools
 import sqlite3
 import logging
 import os
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from core.storage import BaseStorage
 
 logger = logging.getLogger(__name__)
 
+# Columns are TEXT, so only values whose TEXT conversion matches str() are bound
+# as-is; ints outside INTEGER range, floats (SQLite keeps 15 digits), bool, dict,
+# list, ... are stored as str().
+_SQLITE_NATIVE = frozenset({str, bytes, type(None)})
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# (db_path, table, unique_columns) -> columns known to exist, so steady-state
+# stores skip the sqlite_master / PRAGMA table_info probe and index DDL.
+_SCHEMA_CACHE: Dict[tuple, frozenset] = {}
+_SCHEMA_LOCK = threading.Lock()
+
 
 class SQLiteStorage(BaseStorage):
     def __init__(self, db_path: str):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Writes run off the event loop on one thread, so they queue here instead
+        # of contending for SQLite's write lock; reads use the default pool.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
 
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, timeout=30)
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA busy_timeout=5000")
+        # WAL makes NORMAL durable across crashes (only the last commits can roll back)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        conn.execute("PRAGMA mmap_size=268435456")
         return conn
 
     async def store(self, records: List[Dict], source_config: Dict) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            self._writer, self._store_sync, records, source_config,
+        )
+
+    def _store_sync(self, records: List[Dict], source_config: Dict) -> None:
         table = source_config.get("table")
         if not table:
             logger.error("No 'table' in storage config, skipping store")
@@ -37,8 +65,14 @@ class SQLiteStorage(BaseStorage):
             logger.info("No records for table %s", table)
             return
 
-        # Filter out empty records
-        records = [r for r in records if r and isinstance(r, dict) and len(r) > 0]
+        # Filter out empty records and collect all field names in the same pass
+        kept: List[Dict] = []
+        all_fields: set[str] = set()
+        for rec in records:
+            if isinstance(rec, dict) and rec:
+                kept.append(rec)
+                all_fields.update(rec)
+        records = kept
         if not records:
             logger.warning("All records empty for table %s after filtering", table)
             return
@@ -46,108 +80,148 @@ class SQLiteStorage(BaseStorage):
         unique_columns = source_config.get("unique_columns", [])
         mode = source_config.get("mode", "insert")
 
+        schema_key = (self.db_path, table, tuple(unique_columns))
+        with _SCHEMA_LOCK:
+            known_columns = _SCHEMA_CACHE.get(schema_key)
+        # Every :memory: connection is a fresh database, so never trust the cache there
+        probe = self.db_path == ":memory:" or known_columns is None or not all_fields <= known_columns
+
+        try:
+            try:
+                known_columns = self._write(table, records, all_fields, unique_columns, mode, probe)
+            except sqlite3.OperationalError:
+                if probe:
+                    raise
+                # Cached schema is stale (table dropped or rebuilt elsewhere): probe and retry once
+                probe = True
+                known_columns = self._write(table, records, all_fields, unique_columns, mode, probe)
+        except Exception as exc:
+            logger.error("SQLite store error for %s: %s", table, exc, exc_info=True)
+            with _SCHEMA_LOCK:
+                _SCHEMA_CACHE.pop(schema_key, None)
+            raise
+        if probe:
+            with _SCHEMA_LOCK:
+                _SCHEMA_CACHE[schema_key] = known_columns
+        logger.info("Stored %d records in %s", len(records), table)
+
+    def _write(self, table: str, records: List[Dict], all_fields: set,
+               unique_columns: List[str], mode: str, probe: bool) -> Optional[frozenset]:
+        """
+        Store *records* in one transaction; probe and widen the schema first if *probe*.
+
+        Returns the table's columns when probed, else ``None``.
+        """
         conn = self._connect()
         cursor = conn.cursor()
-
         try:
-            # Ensure table exists
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                (table,),
-            )
-            table_exists = cursor.fetchone() is not None
-
-            # Collect all field names across all records
-            all_fields: set[str] = set()
-            for rec in records:
-                all_fields.update(rec.keys())
-
-            if not table_exists:
-                columns = sorted(all_fields)
-                col_defs = ", ".join(f'"{c}" TEXT' for c in columns)
-                cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({col_defs})')
-
-                # Create unique index if specified
-                if unique_columns:
-                    idx_cols = ", ".join(f'"{c}"' for c in unique_columns)
-                    idx_name = f"idx_{table}_{'_'.join(unique_columns)}"
-                    cursor.execute(
-                        f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({idx_cols})'
-                    )
-
-                conn.commit()
-                existing_columns = set(columns)
-            else:
-                cursor.execute(f'PRAGMA table_info("{table}")')
-                existing_columns = {row[1] for row in cursor.fetchall()}
-
-                # Add missing columns
-                new_cols = all_fields - existing_columns
-                for col in sorted(new_cols):
-                    try:
-                        cursor.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" TEXT')
-                        logger.info("Added column %s to %s", col, table)
-                    except sqlite3.OperationalError:
-                        pass
-                existing_columns.update(new_cols)
-
-                # Ensure unique index exists
-                if unique_columns:
-                    idx_cols = ", ".join(f'"{c}"' for c in unique_columns)
-                    idx_name = f"idx_{table}_{'_'.join(unique_columns)}"
-                    try:
-                        cursor.execute(
-                            f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({idx_cols})'
-                        )
-                    except sqlite3.OperationalError:
-                        pass
+            # One write transaction (and one WAL sync) for schema changes, delete and insert
+            cursor.execute("BEGIN IMMEDIATE")
+            known_columns = None
+            if probe:
+                known_columns = frozenset(self._ensure_schema(cursor, table, all_fields, unique_columns))
 
             # Overwrite mode: delete all first
             if mode == "overwrite":
                 cursor.execute(f'DELETE FROM "{table}"')
 
             # Insert records in batches
-            columns = sorted(all_fields)
-            col_names = ", ".join(f'"{c}"' for c in columns)
-            placeholders = ", ".join(["?"] * len(columns))
-
-            if unique_columns:
-                sql = f'INSERT OR REPLACE INTO "{table}" ({col_names}) VALUES ({placeholders})'
-            else:
-                sql = f'INSERT INTO "{table}" ({col_names}) VALUES ({placeholders})'
-
-            batch = [
-                tuple(str(rec.get(c, "")) if rec.get(c) is not None else None for c in columns)
+            columns = tuple(sorted(all_fields))
+            sql = _insert_sql(table, columns, bool(unique_columns))
+            cursor.executemany(sql, (
+                tuple(
+                    v if type(v) in _SQLITE_NATIVE
+                    or (type(v) is int and _INT64_MIN <= v <= _INT64_MAX)
+                    else str(v)
+                    for v in map(rec.get, columns)
+                )
                 for rec in records
-            ]
-
-            cursor.executemany(sql, batch)
+            ))
             conn.commit()
-            logger.info("Stored %d records in %s", len(batch), table)
-
-        except Exception as exc:
-            logger.error("SQLite store error for %s: %s", table, exc, exc_info=True)
+            return known_columns
+        except Exception:
             conn.rollback()
             raise
         finally:
             conn.close()
 
+    @staticmethod
+    def _ensure_schema(cursor, table: str, all_fields: set, unique_columns: List[str]) -> set:
+        """Create or widen *table* for *all_fields*; return the columns it now has."""
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+            (table,),
+        )
+        table_exists = cursor.fetchone() is not None
+
+        if not table_exists:
+            columns = sorted(all_fields)
+            col_defs = ", ".join(f'"{c}" TEXT' for c in columns)
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({col_defs})')
+
+            # Create unique index if specified
+            if unique_columns:
+                idx_cols = ", ".join(f'"{c}"' for c in unique_columns)
+                idx_name = f"idx_{table}_{'_'.join(unique_columns)}"
+                cursor.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({idx_cols})'
+                )
+
+            return set(columns)
+
+        cursor.execute(f'PRAGMA table_info("{table}")')
+        existing_columns = {row[1] for row in cursor.fetchall()}
+
+        # Add missing columns
+        new_cols = all_fields - existing_columns
+        for col in sorted(new_cols):
+            try:
+                cursor.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" TEXT')
+                logger.info("Added column %s to %s", col, table)
+            except sqlite3.OperationalError:
+                pass
+        existing_columns.update(new_cols)
+
+        # Ensure unique index exists
+        if unique_columns:
+            idx_cols = ", ".join(f'"{c}"' for c in unique_columns)
+            idx_name = f"idx_{table}_{'_'.join(unique_columns)}"
+            try:
+                cursor.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{idx_name}" ON "{table}" ({idx_cols})'
+                )
+            except sqlite3.OperationalError:
+                pass
+        return existing_columns
+
     async def query(self, sql: str, params: tuple = ()) -> List[Dict]:
         """Run a read query and return list of dicts."""
-        conn = self._connect()
-        conn.row_factory = sqlite3.Row
-        try:
-            cursor = conn.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
+        return await asyncio.to_thread(self.query_sync, sql, params)
 
     def query_sync(self, sql: str, params: tuple = ()) -> List[Dict]:
         """Synchronous query for use in non-async contexts."""
         conn = self._connect()
-        conn.row_factory = sqlite3.Row
         try:
             cursor = conn.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
+            if cursor.description is None:  # statement returned no rows
+                return []
+            # Plain tuples zipped with the names read once beat sqlite3.Row -> dict
+            cols = [d[0] for d in cursor.description]
+            return [dict(zip(cols, row)) for row in cursor.fetchall()]
         finally:
             conn.close()
+
+
+@functools.lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple, upsert: bool) -> str:
+    """INSERT statement for *columns*, built once per table and column set."""
+    col_names = ", ".join(f'"{c}"' for c in columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    verb = "INSERT OR REPLACE" if upsert else "INSERT"
+    return f'{verb} INTO "{table}" ({col_names}) VALUES ({placeholders})'
+
+
+@functools.lru_cache(maxsize=None)
+def get_sqlite_storage(db_path: str) -> SQLiteStorage:
+    """Shared SQLiteStorage for *db_path*, one instance per database file."""
+    return SQLiteStorage(db_path)
@@ -5,6 +5,7 @@ import asyncio
 import os
 import tempfile
 import json
+import statistics
 
 # ── Parser Tests ─────────────────────────────────────────────────────
 
@@ -87,6 +88,111 @@ class TestUrlTemplate:
         assert result[1]["league_id"] == 2
 
 
+class TestHttpFetcher:
+    def _make_fetcher(self, cache_dir):
+        from core.fetcher import HttpFetcher
+        return HttpFetcher({"url": "https://api.com/x"}, None, [], [], cache_dir=cache_dir)
+
+    @pytest.mark.asyncio
+    async def test_cache_roundtrip(self, tmp_path):
+        from core.fetcher import _MISS
+        f = self._make_fetcher(str(tmp_path))
+        await f._write_cache("json", {"a": [1, 2.5, None]}, ttl=60)
+        await f._write_cache("text", "a,b\n1,2", ttl=60)
+        f._mem_cache.clear()
+        assert await f._read_cache("json", ttl=60) == {"a": [1, 2.5, None]}
+        assert await f._read_cache("text", ttl=60) == "a,b\n1,2"
+        assert await f._read_cache("missing", ttl=60) is _MISS
+        assert sorted(os.listdir(tmp_path)) == ["json.json", "text.txt"]
+
+    @pytest.mark.asyncio
+    async def test_memory_hits_skip_disk_and_return_fresh_objects(self, tmp_path):
+        f = self._make_fetcher(str(tmp_path))
+        await f._write_cache("k", {"rows": [{"id": 1}]}, ttl=60)
+        os.remove(tmp_path / "k.json")
+        first = await f._read_cache("k", ttl=60)
+        first["rows"][0]["id"] = 99
+        assert await f._read_cache("k", ttl=60) == {"rows": [{"id": 1}]}
+
+        fresh = self._make_fetcher(str(tmp_path))  # cold index falls back to disk
+        await fresh._write_cache("d", [1], ttl=60)
+        fresh._mem_cache.clear()
+        assert await fresh._read_cache("d", ttl=60) == [1]
+        assert "d" in fresh._mem_cache
+
+    @pytest.mark.asyncio
+    async def test_paginated_fetch_stops_at_first_empty_page(self, tmp_path):
+        f = self._make_fetcher(str(tmp_path))
+        f.config["pagination"] = {"param": "page", "max_pages": 10, "concurrency": 4}
+        requested = []
+
+        async def fake_fetch_one(url, params):
+            requested.append(params["page"])
+            await asyncio.sleep(0.001 * (10 - params["page"]))  # finish out of order
+            return [params["page"]] if params["page"] <= 6 else []
+
+        f._fetch_one = fake_fetch_one
+        assert await f.fetch() == [[1], [2], [3], [4], [5], [6]]
+        assert sorted(requested) == list(range(1, 9))
+
+    @pytest.mark.asyncio
+    async def test_paginated_fetch_cancels_window_on_error(self, tmp_path):
+        f = self._make_fetcher(str(tmp_path))
+        f.config["pagination"] = {"param": "page", "max_pages": 4, "concurrency": 4}
+        cancelled = []
+
+        async def fake_fetch_one(url, params):
+            if params["page"] == 2:
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(params["page"])
+                raise
+
+        f._fetch_one = fake_fetch_one
+        with pytest.raises(RuntimeError):
+            await f.fetch()
+        assert sorted(cancelled) == [1, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self, tmp_path):
+        f = self._make_fetcher(str(tmp_path))
+        calls = []
+
+        async def fake_request(url, params):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return True, b'{"rows": [1]}'
+
+        f._request = fake_request
+        a, b = await asyncio.gather(f._fetch_one("u", {}), f._fetch_one("u", {}))
+        assert calls == ["u"]
+        assert a == b == {"rows": [1]} and a is not b
+        assert f._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_joined_callers(self, tmp_path):
+        f = self._make_fetcher(str(tmp_path))
+        calls = []
+
+        async def fake_request(url, params):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return True, b'{"rows": [1]}'
+
+        f._request = fake_request
+        owner = asyncio.create_task(f._fetch_one("u", {}))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(f._fetch_one("u", {}))
+        await asyncio.sleep(0)
+        owner.cancel()
+        assert await waiter == {"rows": [1]}
+        assert owner.cancelled()
+        assert calls == ["u", "u"]
+        assert f._inflight == {}
+
+
 # ── Transformer Tests ────────────────────────────────────────────────
 
 class TestTransformer:
@@ -108,6 +214,11 @@ class TestTransformer:
         result = t.transform([{"a": {"b": 1, "c": 2}, "d": 3}])
         assert result[0] == {"a_b": 1, "a_c": 2, "d": 3}
 
+    def test_flatten_deep_keeps_key_order(self):
+        t = self._make_transformer([{"operation": "flatten"}])
+        result = t.transform([{"x": 0, "a": {"b": {"c": 1}, "d": 2}, "e": {}, "f": 3}])
+        assert list(result[0].items()) == [("x", 0), ("a_b_c", 1), ("a_d", 2), ("f", 3)]
+
     def test_filter(self):
         t = self._make_transformer([{"operation": "filter", "condition": "score > 50"}])
         result = t.transform([{"score": 60}, {"score": 40}, {"score": 70}])
@@ -118,11 +229,84 @@ class TestTransformer:
         result = t.transform([{"a": 10, "b": 20}])
         assert result[0]["total"] == 30
 
+    def test_compute_and_filter_vectorized(self):
+        t = self._make_transformer([
+            {"operation": "compute", "expression": "ratio = points / games"},
+            {"operation": "filter", "condition": "ratio >= 2 and games > 1"},
+        ])
+        records = [{"points": i * 2, "games": i} for i in range(1, 401)]
+        result = t.transform(records)
+        assert len(result) == 399
+        assert result[0] == {"points": 4, "games": 2, "ratio": 2.0}
+        assert type(result[0]["points"]) is int
+
+    def test_compute_vectorized_falls_back_per_record(self):
+        t = self._make_transformer([{"operation": "compute", "expression": "ratio = points // games"}])
+        records = [{"points": 10, "games": i} for i in range(300)]
+        result = t.transform(records)
+        assert "ratio" not in result[0]
+        assert result[5]["ratio"] == 2
+
+    def test_vectorized_int_overflow_falls_back(self):
+        t = self._make_transformer([
+            {"operation": "compute", "expression": "c = a * b"},
+            {"operation": "filter", "condition": "a * b > 0"},
+        ])
+        result = t.transform([{"a": 2 ** 62, "b": 4} for _ in range(300)])
+        assert len(result) == 300
+        assert result[0]["c"] == 2 ** 64
+
+        t = self._make_transformer([{"operation": "compute", "expression": "c = a * a * a"}])
+        result = t.transform([{"a": 2 ** 20 + i} for i in range(300)])
+        assert all(r["c"] == r["a"] ** 3 for r in result)
+
+    def test_fused_steps(self):
+        t = self._make_transformer([
+            {"operation": "rename", "mapping": {"web_name": "name"}},
+            {"operation": "compute", "expression": "label = name.upper()"},
+            {"operation": "template", "template": "{{ label }}#{{ id }}", "target_field": "key"},
+            {"operation": "filter", "condition": "id > 1"},
+            {"operation": "add_field", "field": "source", "value": "fpl"},
+        ])
+        result = t.transform([{"id": 1, "web_name": "Saka"}, {"id": 2, "web_name": "Salah"}])
+        assert result == [{"id": 2, "name": "Salah", "label": "SALAH", "key": "SALAH#2", "source": "fpl"}]
+
+    def test_fused_block_skips_only_failing_step(self):
+        t = self._make_transformer([
+            {"operation": "rename", "mapping": {"a": "b"}},
+            {"operation": "template", "template": "{{ foo() }}", "target_field": "t"},
+            {"operation": "add_field", "field": "src", "value": "x"},
+        ])
+        assert t.transform([{"a": 1}, {"a": 2}]) == [{"b": 1, "src": "x"}, {"b": 2, "src": "x"}]
+
+        t = self._make_transformer([
+            {"operation": "add_field", "field": "src", "value": "x"},
+            {"operation": "template", "template": "{{ a.upper() }}", "target_field": "t"},
+        ])
+        records = [{"a": "s"}, {"a": 2}, {"a": "q"}]
+        assert t.transform(records) == [{"a": "s", "src": "x"}, {"a": 2, "src": "x"}, {"a": "q", "src": "x"}]
+        assert records == [{"a": "s"}, {"a": 2}, {"a": "q"}]
+
     def test_add_field(self):
         t = self._make_transformer([{"operation": "add_field", "field": "source", "value": "test"}])
         result = t.transform([{"id": 1}])
         assert result[0]["source"] == "test"
 
+    def test_template(self):
+        t = self._make_transformer([
+            {"operation": "template", "template": "{{ home }} vs {{ away }}", "target_field": "title"}
+        ])
+        result = t.transform([{"home": "Arsenal", "away": "Spurs"}, {"home": "Everton", "away": "Wolves"}])
+        assert result[0]["title"] == "Arsenal vs Spurs"
+        assert result[1]["title"] == "Everton vs Wolves"
+
+    def test_template_placeholder_fast_path_matches_jinja(self):
+        from jinja2 import Template
+        from core.transformer import _compile_template
+        record = {"home": "Arsenal", "score": None, "xg": 1.5}
+        for src in ["{{ home }}: {{score}} ({{ xg }}) {{ missing }}", "{% if xg %}{{ home }}{% endif %}", "a {b}"]:
+            assert _compile_template(src)(record) == Template(src).render(**record)
+
 
 # ── SQLiteStorage Tests ──────────────────────────────────────────────
 
@@ -177,6 +361,280 @@ class TestSQLiteStorage:
         assert len(rows) == 1
         assert rows[0]["points"] == "60"
 
+    @pytest.mark.asyncio
+    async def test_schema_cache_widens_and_recovers(self, db_path):
+        from storage.sqlite_storage import SQLiteStorage
+        s = SQLiteStorage(db_path)
+        await s.store([{"id": "1"}], {"table": "t"})
+        await s.store([{"id": "2", "extra": "x"}], {"table": "t"})  # new column still added
+        await s.query("DROP TABLE t")
+        await s.store([{"id": "3"}], {"table": "t"})  # stale cache is re-probed
+
+        rows = await s.query("SELECT * FROM t")
+        assert rows == [{"id": "3"}]
+
+    @pytest.mark.asyncio
+    async def test_store_keeps_str_of_floats_and_big_ints(self, db_path):
+        from storage.sqlite_storage import SQLiteStorage
+        s = SQLiteStorage(db_path)
+        await s.store([{"a": 1 / 3, "b": 1e20, "c": 2 ** 64, "d": 7, "e": None}], {"table": "t"})
+
+        rows = await s.query("SELECT * FROM t")
+        assert rows == [{"a": str(1 / 3), "b": "1e+20", "c": str(2 ** 64), "d": "7", "e": None}]
+
+
+class TestFileStorage:
+    @pytest.mark.asyncio
+    async def test_store_jsonl(self, tmp_path):
+        from storage.file_storage import FileStorage
+        s = FileStorage(str(tmp_path))
+        records = [{"id": 1, "name": "Łódź"}, {"id": 2}]
+        await s.store(records, {"table": "t", "format": "jsonl"})
+
+        with open(tmp_path / "t.jsonl", encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == records
+
+    @pytest.mark.asyncio
+    async def test_store_csv_unions_columns(self, tmp_path):
+        from storage.file_storage import FileStorage
+        s = FileStorage(str(tmp_path))
+        await s.store([{"id": 1, "a": "x"}, {"id": 2, "b": 3.5}], {"table": "t", "format": "csv"})
+
+        with open(tmp_path / "t.csv", encoding="utf-8") as f:
+            assert f.read().splitlines() == ["id,a,b", "1,x,", "2,,3.5"]
+
+
+class TestMultiStorage:
+    @pytest.mark.asyncio
+    async def test_failing_backend_does_not_block_others(self, tmp_path):
+        from core.storage import BaseStorage, MultiStorage
+        from storage.file_storage import FileStorage
+
+        class Broken(BaseStorage):
+            async def store(self, records, source_config):
+                raise RuntimeError("disk full")
+
+        s = MultiStorage([Broken(), FileStorage(str(tmp_path))])
+        await s.store([{"id": 1}], {"table": "t", "format": "jsonl"})
+        assert (tmp_path / "t.jsonl").exists()
+
+        with pytest.raises(RuntimeError):
+            await MultiStorage([Broken()]).store([{"id": 1}], {})
+
+
+# ── DataSource Tests ─────────────────────────────────────────────────
+
+class TestDataSourceSession:
+    @pytest.mark.asyncio
+    async def test_http_session_returns_to_pool(self):
+        from sources.elo import EloSource
+        pool = asyncio.Queue(maxsize=2)
+        src = EloSource({"name": "elo_epl"}, {"default_storage": {"path": ":memory:"}}, session_pool=pool)
+        async with src._http_session() as first:
+            pass
+        async with src._http_session() as second:
+            assert pool.empty()
+        assert first is second
+        assert pool.qsize() == 1
+        await pool.get_nowait().close()
+
+    @pytest.mark.asyncio
+    async def test_scheduler_shutdown_drains_session_pool(self):
+        import functools
+        import aiohttp
+        from core.base import close_session_pool
+        from core.scheduler import Scheduler
+        pool = asyncio.Queue()
+        sessions = [aiohttp.ClientSession() for _ in range(3)]
+        for s in sessions:
+            pool.put_nowait(s)
+        scheduler = Scheduler()
+        scheduler.on_shutdown(functools.partial(close_session_pool, pool))
+        scheduler.start()
+        await scheduler.shutdown()
+        assert pool.empty()
+        assert all(s.closed for s in sessions)
+
+    @pytest.mark.asyncio
+    async def test_run_closes_fetcher_session(self, tmp_path):
+        from sources.fpl import FPLSource
+        src = FPLSource({"name": "fpl", "fetcher": {"url": "http://localhost/"}},
+                        {"default_storage": {"path": ":memory:"}, "network": {"cache_dir": str(tmp_path)}},
+                        None, None)
+        session = src.fetcher._get_session()
+
+        async def no_data():
+            return None
+        src.fetch = no_data
+        await src.run()
+        assert session.closed
+
+
+class TestDataSourceBatching:
+    @pytest.mark.asyncio
+    async def test_batched_run_stores_every_slice(self):
+        from core.base import DataSource
+
+        class Counting(DataSource):
+            async def fetch(self):
+                return list(range(5))
+
+            async def parse(self, raw_data):
+                self.parsed = [{"n": n} for n in raw_data]
+                return self.parsed
+
+            async def transform(self, records):
+                return records
+
+            async def store(self, records):
+                self.stored.append([r["n"] for r in records])
+
+        src = Counting({"name": "c", "batch_size": 2}, {})
+        src.stored = []
+        await src.run()
+        assert src.stored == [[0, 1], [2, 3], [4]]
+        assert src.parsed == [{"n": n} for n in range(5)]
+
+
+# ── Source Parser Tests ──────────────────────────────────────────────
+
+class TestUnderstatSource:
+    @pytest.mark.asyncio
+    async def test_parse_team_totals(self):
+        from sources.understat import UnderstatSource
+        teams = {"89": {"title": "Man City", "history": [
+            {"xG": 1.5, "xGA": 0.5, "npxG": 1.2, "scored": 2, "missed": 0},
+            {"xG": "2.25", "xGA": 1, "scored": "1", "missed": 1},
+        ]}}
+        payload = json.dumps(teams).replace('"', "\\x22")
+        html = f"<script>var teamsData = JSON.parse('{payload}');</script>"
+        src = UnderstatSource({"name": "understat_epl"}, {"default_storage": {"path": ":memory:"}})
+
+        [team] = await src.parse(html)
+        assert team["team"] == "Man City"
+        assert (team["matches_played"], team["goals"], team["conceded"]) == (2, 3, 1)
+        assert team["xg_total"] == 3.75 and team["xga_per_match"] == 0.75
+
+
+    @pytest.mark.asyncio
+    async def test_read_payloads_without_charset(self):
+        from types import SimpleNamespace
+        from sources.understat import UnderstatSource
+
+        async def chunks(size):
+            yield "<script>var teamsData = JSON.parse('{}');".encode()
+            yield b"var playersData = JSON.parse('[]');</script>\xc3\xa9"
+
+        def no_fallback():
+            raise RuntimeError("Cannot compute fallback encoding of a not yet read body")
+        resp = SimpleNamespace(charset=None, get_encoding=no_fallback,
+                               content=SimpleNamespace(iter_chunked=chunks))
+        html = await UnderstatSource._read_payloads(resp)
+        assert "playersData" in html and html.endswith("\u00e9")
+
+
+class TestFCISource:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_arrow", [True, False])
+    async def test_parse_local_csv(self, tmp_path, monkeypatch, use_arrow):
+        import sources.fci as fci
+        if not use_arrow:
+            monkeypatch.setattr(fci, "pa", None)
+        elif fci.pa is None:
+            pytest.skip("pyarrow not installed")
+        path = tmp_path / "stats.csv"
+        path.write_text('player,minutes\r\n"Multi\nline",90\r\n\r\nSalah,45\r\n', encoding="utf-8")
+        src = fci.FCISource({"name": "fci", "params": {"csv_path": str(path)}},
+                            {"default_storage": {"path": ":memory:"}})
+
+        records = await src.transform(await src.parse(await src.fetch()))
+        assert [(r["player"], r["minutes"]) for r in records] == [("Multi\nline", 90.0), ("Salah", 45.0)]
+        assert records[0]["fetched_at"] == records[1]["fetched_at"]
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text, expected", [
+        ('player,minutes,team\r\n"Multi\r\nline",,ARS\r\n\r\nSalah,45,LIV\r\n',
+         [{"player": "Multi\nline", "minutes": "", "team": "ARS"},
+          {"player": "Salah", "minutes": 45.0, "team": "LIV"}]),
+        ("player,minutes,team\nSaka,90\nSalah,45,LIV,x\n",
+         [{"player": "Saka", "minutes": 90.0, "team": None},
+          {"player": "Salah", "minutes": 45.0, "team": "LIV", None: ["x"]}]),
+    ])
+    async def test_arrow_and_csv_paths_agree(self, tmp_path, monkeypatch, text, expected):
+        import sources.fci as fci
+        if fci.pa is None:
+            pytest.skip("pyarrow not installed")
+        path = tmp_path / "stats.csv"
+        path.write_bytes(text.encode())
+        src = fci.FCISource({"name": "fci", "params": {"csv_path": str(path)}},
+                            {"default_storage": {"path": ":memory:"}})
+
+        results = []
+        for pa in (fci.pa, None):
+            monkeypatch.setattr(fci, "pa", pa)
+            records = await src.transform(await src.parse(await src.fetch()))
+            results.append([{k: v for k, v in r.items() if k != "fetched_at"} for r in records])
+        assert results == [expected, expected]
+
+
+class TestCollectLeagueHistory:
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_managers(self, monkeypatch, tmp_path):
+        import core.config
+        import sources.fpl as fpl
+        pending = []
+
+        async def collect(mid, session, sem, rate_limiter):
+            if mid == 1:
+                raise RuntimeError("boom")
+            pending.append(asyncio.current_task())
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(core.config, "get_config",
+                            lambda: {"default_storage": {"path": str(tmp_path / "t.db")}})
+        monkeypatch.setattr(fpl, "_league_manager_ids", lambda db_path, league_id: [2, 3, 1])
+        monkeypatch.setattr(fpl, "_collect_manager", collect)
+        with pytest.raises(RuntimeError):
+            await fpl.collect_league_history(7)
+        assert len(pending) == 2 and all(task.cancelled() for task in pending)
+
+
+# ── ML Feature Tests ─────────────────────────────────────────────────
+
+class TestFeatureEngine:
+    def test_history_stats_groups_by_manager(self):
+        from ml.features import _history_stats
+        history = [{"manager_id": "1", "event": str(gw), "points": str(p), "event_transfers": "1",
+                    "event_transfers_cost": "4" if gw == 2 else "0"}
+                   for gw, p in enumerate([10, 20, 30, 40, 50, 60], 1)]
+        history.insert(0, {"manager_id": 2, "event": "1", "points": None, "total_points": "7"})
+        stats = _history_stats(history)
+
+        form, transfers, cost, consistency = stats["1"]
+        assert form == 40.0  # last five GWs
+        assert (transfers, cost) == (6, 4)
+        assert consistency == pytest.approx(1 - statistics.pstdev([10, 20, 30, 40, 50, 60]) / 35)
+        assert stats["2"] == (7.0, 0, 0, 0.0)
+
+    def test_safe_int(self):
+        from ml.features import _safe_int
+        assert [_safe_int(v) for v in (7, "60", "60.0", 60.9, "1e3", True)] == [7, 60, 60, 60, 1000, 1]
+        assert _safe_int(None, 5) == 5 and _safe_int("n/a", -1) == -1 and _safe_int([1]) == 0
+
+    def test_lri_ranks_by_weighted_score(self):
+        from ml.features import MLFeatureEngine
+        engine = MLFeatureEngine(db=None)
+        columns = {
+            "manager_id": ("a", "b", "c"),
+            "form_5gw": (10.0, 20.0, 10.0),
+            "rank_percentile": (0.0, 1.0, 0.0),
+        }
+        lri = engine._calculate_lri(columns)
+        assert [r["manager_id"] for r in lri] == ["b", "a", "c"]
+        assert [r["lri_rank"] for r in lri] == [1, 2, 3]
+        assert lri[0]["lri_score"] == 3.2
+
 
 # ── Rate Limiter Tests ───────────────────────────────────────────────
 
@@ -197,6 +655,57 @@ class TestRateLimiter:
             rl.update_delay(success=True)
         assert rl.current_delay < 5.0
 
+    def test_success_count_tracks_window(self):
+        from rate_limiter import AdaptiveRateLimiter
+        rl = AdaptiveRateLimiter({"success_window": 4})
+        for ok in (True, False, True, True, False, True, True):
+            rl.update_delay(success=ok)
+        assert rl._success_count == sum(rl.success_history) == 3
+
+    def test_rate_limit_headers_raise_delay(self):
+        from rate_limiter import AdaptiveRateLimiter
+        rl = AdaptiveRateLimiter({"base_delay": 0.5, "max_delay": 10.0, "backoff_factor": 2.0})
+        rl.update_from_response(429, {"Retry-After": "60"})
+        assert rl.current_delay < 2.0  # Retry-After is a one-off pause, not the standing delay
+        before = rl.current_delay
+        rl.update_from_response(200, {"X-RateLimit-Remaining": "0"})
+        assert rl.current_delay > before
+
+    @pytest.mark.asyncio
+    async def test_get_json_waits_out_429_and_retries(self):
+        from contextlib import asynccontextmanager
+        from types import SimpleNamespace
+        from rate_limiter import AdaptiveRateLimiter
+        from sources.fpl import _get_json
+        responses = [(429, {"Retry-After": "30"}), (200, {})]
+        pauses = []
+
+        class Limiter(AdaptiveRateLimiter):
+            async def pause(self, seconds):
+                pauses.append(seconds)
+                await super().pause(0)
+
+        class Session:
+            @asynccontextmanager
+            async def get(self, url):
+                status, headers = responses.pop(0)
+
+                async def json():
+                    return {"current": [1]}
+                yield SimpleNamespace(status=status, headers=headers, json=json)
+
+        rl = Limiter({"base_delay": 0, "min_delay": 0, "max_delay": 10.0})
+        assert await _get_json(Session(), "u", rl) == {"current": [1]}
+        assert pauses == [30] and not responses
+
+    def test_not_found_is_not_a_failure(self):
+        from rate_limiter import AdaptiveRateLimiter
+        rl = AdaptiveRateLimiter({"base_delay": 1.0})
+        rl.update_from_response(404, {})
+        assert rl.consecutive_errors == 0 and rl.current_delay <= 1.1
+        rl.update_from_response(503, {})
+        assert rl.consecutive_errors == 1
+
 
 # ── Config Tests ─────────────────────────────────────────────────────
 
@@ -217,3 +726,18 @@ class TestConfig:
         assert cfg["key"] == "hello"
         assert cfg["default"] == "fallback"
         del os.environ["TEST_VAR"]
+
+    def test_get_config_reloads_only_when_watched(self, tmp_path, monkeypatch):
+        import core.config as config_mod
+        path = tmp_path / "config.yaml"
+        path.write_text("a: 1\n")
+        monkeypatch.setattr(config_mod, "_CONFIG_PATH", str(path))
+        monkeypatch.setattr(config_mod, "_config", None)
+        assert config_mod.get_config() == {"a": 1}
+
+        path.write_text("a: 2\n")
+        os.utime(path, ns=(0, 1))
+        monkeypatch.delenv("DSDP_CFG_WATCH", raising=False)
+        assert config_mod.get_config() == {"a": 1}
+        monkeypatch.setenv("DSDP_CFG_WATCH", "1")
+        assert config_mod.get_config() == {"a": 2}
@@ -8,15 +8,19 @@ def extract_domain(record: dict) -> dict:
     return record
 
 
+_TEAM_NAME_MAP = {
+    "Man Utd": "Manchester United",
+    "Man City": "Manchester City",
+    "Spurs": "Tottenham Hotspur",
+    "Nott'm Forest": "Nottingham Forest",
+}
+_TEAM_NAME_FIELDS = tuple((f, f"{f}_normalized") for f in ("team", "team_name", "team_fpl"))
+
+
 def normalize_team_name(record: dict) -> dict:
     """Normalize team names for cross-source joins."""
-    name_map = {
-        "Man Utd": "Manchester United",
-        "Man City": "Manchester City",
-        "Spurs": "Tottenham Hotspur",
-        "Nott'm Forest": "Nottingham Forest",
-    }
-    for field in ("team", "team_name", "team_fpl"):
-        if field in record and record[field] in name_map:
-            record[f"{field}_normalized"] = name_map[record[field]]
+    for field, out_field in _TEAM_NAME_FIELDS:
+        normalized = _TEAM_NAME_MAP.get(record.get(field))
+        if normalized is not None:
+            record[out_field] = normalized
     return record
@@ -1,5 +1,6 @@
-"""Utility helpers: config loading, logging setup, env var resolution."""
+"""Utility helpers: config loading, logging setup, env var resolution, JSON."""
 
+import json
 import yaml
 import logging
 import os
@@ -7,11 +8,38 @@ import re
 import sys
 from logging.handlers import TimedRotatingFileHandler
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:  # stdlib json is the fallback
+    orjson = None
+
+# orjson raises a subclass of this, so one except clause covers both backends.
+JSONDecodeError = json.JSONDecodeError
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> bytes:
+        """Serialize *obj* to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=str)
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        """Serialize *obj* to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
 
 def load_config(path: str) -> dict:
     """Load YAML config with basic validation."""
     with open(path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     # Ensure required top-level keys exist with defaults
     defaults = {
@@ -27,36 +55,36 @@ def load_config(path: str) -> dict:
     }
 
     for key, default in defaults.items():
-        if key not in config:
-            config[key] = default
-        elif isinstance(default, dict):
-            for k, v in default.items():
-                config[key].setdefault(k, v)
+        if isinstance(default, dict):
+            config[key] = {**default, **(config.get(key) or {})}
+        else:
+            config.setdefault(key, default)
 
     return config
 
 
+_ENV_VAR = re.compile(r"\$\{(\w+)(?::([^}]*))?\}")
+
+
 def resolve_env_vars(config: dict) -> None:
     """
-    Recursively replace ``${ENV_VAR}`` or ``${ENV_VAR:default}`` patterns
-    with environment variable values.
+    Replace ``${ENV_VAR}`` or ``${ENV_VAR:default}`` patterns
+    with environment variable values, in place, throughout nested dicts and lists.
     """
-    pattern = re.compile(r"\$\{(\w+)(?::([^}]*))?\}")
-
-    def _resolve(obj):
-        if isinstance(obj, str):
-            def _replacer(m):
-                var, default = m.group(1), m.group(2)
-                return os.environ.get(var, default if default is not None else m.group(0))
-            return pattern.sub(_replacer, obj)
-        elif isinstance(obj, dict):
-            return {k: _resolve(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [_resolve(i) for i in obj]
-        return obj
-
-    for key in list(config.keys()):
-        config[key] = _resolve(config[key])
+    def _replacer(m):
+        var, default = m.group(1), m.group(2)
+        return os.environ.get(var, default if default is not None else m.group(0))
+
+    # Iterative, in-place walk: only strings that contain ``${`` are rebuilt.
+    stack = [config]
+    while stack:
+        obj = stack.pop()
+        for k, v in (obj.items() if isinstance(obj, dict) else enumerate(obj)):
+            if isinstance(v, str):
+                if "${" in v:
+                    obj[k] = _ENV_VAR.sub(_replacer, v)
+            elif isinstance(v, (dict, list)):
+                stack.append(v)
 
 
 def setup_logging(config: dict) -> None: